@@ -1,17 +1,25 @@
 from __future__ import annotations
 
+import argparse
+import fnmatch
 import importlib.util
 import os
 import subprocess
 import sys
+import threading
+import time
 import traceback
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
 from pathlib import Path
 
 from dotenv import load_dotenv
 
+from agent_runner_base.agent_runtime.discovery import AgentIndex, load_index
 from agent_runner_base.agent_runtime.game_capture_runner import run_game_capture
-from agent_runner_base.state.store import write_run
+from agent_runner_base.agent_runtime.launcher import WarmPool
+from agent_runner_base.state.store import write_batch, write_run
 
 # -------------------------
 # Setup
@@ -43,19 +51,20 @@ if BASE_ROOT.exists() and str(BASE_ROOT) not in sys.path:
 # -------------------------
 # Dynamic Agent Discovery
 # -------------------------
-def get_agents() -> list[Path]:
-    """Scan agent_list and return a list of .py file paths."""
-    agents: list[Path] = []
-    folder = REPO_ROOT / "agent_list"
-    if not folder.exists():
-        return agents
+_INDEX: AgentIndex | None = None
+
+
+def agent_index() -> AgentIndex:
+    """The discovery index (state/agent_index.json), refreshed once per runner process."""
+    global _INDEX
+    if _INDEX is None:
+        _INDEX = load_index(agents_dir=REPO_ROOT / "agent_list", repo_root=REPO_ROOT)
+    return _INDEX
 
-    for py in folder.rglob("*.py"):
-        if py.name.startswith("_") or py.name == "__init__.py":
-            continue
-        agents.append(py)
 
-    return sorted(agents)
+def get_agents() -> list[Path]:
+    """The .py file paths under agent_list, from the discovery index (no tree scan when nothing changed)."""
+    return [entry.file(REPO_ROOT) for entry in agent_index().agents()]
 
 
 def pyfile_to_module(py_file: Path, repo_root: Path) -> str:
@@ -71,7 +80,10 @@ def pyfile_to_module(py_file: Path, repo_root: Path) -> str:
 
 
 def module_to_file_path(module_path: str) -> Path | None:
-    """If module is importable, return its file path (spec.origin)."""
+    """If module is importable, return its file path (from the index for agents, else spec.origin)."""
+    entry = agent_index().get(module_path)
+    if entry is not None:
+        return entry.file(REPO_ROOT)
     try:
         spec = importlib.util.find_spec(module_path)
     except Exception:
@@ -83,8 +95,10 @@ def module_to_file_path(module_path: str) -> Path | None:
 
 def choose_agent(agent_list: list[Path]) -> Path:
     print("\nSelect an agent to run:\n")
+    names = {entry.file(REPO_ROOT): entry.name for entry in agent_index().agents()}
     for idx, agent in enumerate(agent_list, start=1):
-        print(f"{idx}. {agent.stem}")
+        name = names.get(agent)
+        print(f"{idx}. {agent.stem}" + (f" ({name})" if name and name != agent.stem else ""))
 
     choice = input("\nAgent> ").strip()
 
@@ -93,9 +107,10 @@ def choose_agent(agent_list: list[Path]) -> Path:
         if 1 <= idx <= len(agent_list):
             return agent_list[idx - 1]
 
-    for agent in agent_list:
-        if choice == agent.stem:
-            return agent
+    # stem, module or the agent's `name`
+    entry = agent_index().resolve(choice)
+    if entry is not None and entry.file(REPO_ROOT) in agent_list:
+        return entry.file(REPO_ROOT)
 
     print("Invalid choice. Exiting.")
     sys.exit(1)
@@ -115,24 +130,39 @@ def print_diagnostics() -> None:
     print("-------------------\n")
 
 
-def run_module_with_fallback(mod: str, env: dict) -> int:
+def run_module_with_fallback(mod: str, env: dict, *, stdout=None, stderr=None, timeout: float | None = None,
+                             pool: WarmPool | None = None) -> int:
     """
     Try: python -m <module>
     If that fails and we can resolve a file path, fall back to running the file directly.
+    stdout/stderr (open files) capture the agent's output instead of inheriting the console;
+    a run longer than timeout seconds is killed and raises subprocess.TimeoutExpired (no fallback).
+    With a pool, both attempts run on its pre-started interpreters instead of fresh ones.
     """
-    print(f"Launching via -m: {mod}")
-    r = subprocess.run([sys.executable, "-m", mod], cwd=str(REPO_ROOT), env=env)
-    if r.returncode == 0:
-        return 0
+    def say(msg: str) -> None:
+        print(msg, file=stdout or sys.stdout, flush=True)
+
+    def run(cmd: list[str]) -> int:
+        try:
+            if pool is not None:
+                return pool.run(cmd[1:], env, cwd=REPO_ROOT, stdout=stdout, stderr=stderr, timeout=timeout)
+            return subprocess.run(cmd, cwd=str(REPO_ROOT), env=env, stdout=stdout, stderr=stderr, timeout=timeout).returncode
+        except subprocess.TimeoutExpired:
+            say(f"\n❌ timed out after {timeout}s: {' '.join(cmd)}")
+            raise
+
+    say(f"Launching via -m: {mod}")
+    code = run([sys.executable, "-m", mod])
+    if code == 0:
+        return code
 
     path = module_to_file_path(mod)
     if path and path.exists() and path.suffix == ".py":
-        print(f"\n⚠ -m failed (code={r.returncode}). Fallback: run file directly: {path}")
-        r2 = subprocess.run([sys.executable, str(path)], cwd=str(REPO_ROOT), env=env)
-        return r2.returncode
+        say(f"\n⚠ -m failed (code={code}). Fallback: run file directly: {path}")
+        return run([sys.executable, str(path)])
 
-    print(f"\n❌ -m failed (code={r.returncode}) and no runnable file path found for: {mod}")
-    return r.returncode
+    say(f"\n❌ -m failed (code={code}) and no runnable file path found for: {mod}")
+    return code
 
 
 def ask_yes_no(prompt: str) -> bool:
@@ -142,7 +172,207 @@ def ask_yes_no(prompt: str) -> bool:
     return ans == "y"
 
 
+# -------------------------
+# Batch mode (non-interactive)
+# -------------------------
+GAME_ENTRYPOINT = REPO_ROOT / "game" / "PygameTest" / "20251024" / "main.py"  # writes trace + metrics, has bench_game.py
+LOGS_DIR = REPO_ROOT / "logs"
+
+
+@dataclass
+class BatchJob:
+    agent: str
+    module: str
+    trial: int
+    trace_id: str
+    returncode: int | None = None  # None if the agent never finished
+    timed_out: bool = False  # agent killed at --timeout
+    duration_sec: float = 0.0
+    stdout_log: str = ""
+    game_returncode: int | None = None
+    game_timed_out: bool = False  # stopped at --game-timeout (the normal end of an interactive game)
+    benchmark: bool = False  # the game run was bench_game.py, which exits on its own
+    game_metrics: dict | None = None  # frame time / stutter summary of the game run
+    run_record: str | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        # main.py never exits by itself, so a game stopped at the timeout is a finished capture
+        game_ok = self.game_returncode in (None, 0) or (self.game_timed_out and not self.benchmark)
+        return self.returncode == 0 and game_ok and not self.error
+
+
+def select_agents(agents: list[Path], selectors: list[str]) -> list[Path]:
+    """
+    Agents matching any selector: a number from the menu, a file stem, a module
+    name, an agent `name`, or a glob on the stem or name (e.g. "test_LLM_*").
+    No selectors = all agents.
+    """
+    if not selectors:
+        return list(agents)
+    names = {entry.file(REPO_ROOT): entry.name or "" for entry in agent_index().agents()}
+    picked: list[Path] = []
+    for sel in selectors:
+        if sel.isdigit() and 1 <= int(sel) <= len(agents):
+            matches = [agents[int(sel) - 1]]
+        else:
+            matches = [a for a in agents
+                       if sel in (a.stem, pyfile_to_module(a, REPO_ROOT), names.get(a))
+                       or fnmatch.fnmatch(a.stem, sel) or fnmatch.fnmatch(names.get(a, ""), sel)]
+        if not matches:
+            raise SystemExit(f"❌ No agent matches: {sel!r}")
+        picked += [a for a in matches if a not in picked]
+    return picked
+
+
+def run_batch_job(job: BatchJob, *, dry_run: bool, timeout: float | None, game: Path | None, game_timeout: int,
+                  benchmark_frames: int | None, pool: WarmPool | None = None) -> BatchJob:
+    """One agent run (plus optional headless game run) with its own TRACE_ID; output goes to logs/."""
+    env = os.environ.copy()
+    env["CODERUNNERX_DRY_RUN"] = "true" if dry_run else "false"
+    env["TRACE_ID"] = job.trace_id
+
+    LOGS_DIR.mkdir(parents=True, exist_ok=True)
+    out_path = LOGS_DIR / f"agent_{job.trace_id}.stdout.txt"
+    err_path = LOGS_DIR / f"agent_{job.trace_id}.stderr.txt"
+    job.stdout_log = str(out_path)
+
+    start = time.perf_counter()
+    # append mode: a warm worker writes to the same files through its own handles
+    with open(out_path, "a", encoding="utf-8") as out, open(err_path, "a", encoding="utf-8") as err:
+        try:
+            job.returncode = run_module_with_fallback(job.module, env, stdout=out, stderr=err, timeout=timeout, pool=pool)
+        except subprocess.TimeoutExpired:
+            job.timed_out = True
+
+    result = None
+    if game is not None and job.returncode == 0:
+        try:
+            result = run_game_capture(
+                entrypoint=game,
+                cwd=REPO_ROOT,
+                trace_id=job.trace_id,
+                timeout_sec=game_timeout,
+                headless=True,
+                env_extra={"TRACE_ID": job.trace_id},
+                benchmark_frames=benchmark_frames,
+            )
+            job.game_returncode = result.returncode
+            job.game_timed_out = result.timed_out
+            job.benchmark = benchmark_frames is not None
+            job.game_metrics = result.metrics
+        except Exception as e:  # one broken run must not take the batch down
+            job.error = f"{type(e).__name__}: {e}"
+    job.duration_sec = time.perf_counter() - start
+
+    job.run_record = str(write_run(
+        trace_id=job.trace_id,
+        agent_module=job.module,
+        agent_returncode=job.returncode,
+        game_result=result,
+    ))
+    return job
+
+
+def run_batch(args: argparse.Namespace) -> int:
+    agents = get_agents()
+    if not agents:
+        print("❌ No agents found under agent_list/. Exiting.")
+        return 1
+    selected = select_agents(agents, args.agents)
+
+    batch_id = time.strftime("%Y%m%d-%H%M%S") + "-" + uuid.uuid4().hex[:6]
+    jobs = [
+        BatchJob(agent=a.stem, module=pyfile_to_module(a, REPO_ROOT), trial=t, trace_id=uuid.uuid4().hex[:8])
+        for a in selected for t in range(1, args.trials + 1)
+    ]
+    print(f"Batch {batch_id}: {len(jobs)} run(s) of {len(selected)} agent(s), {args.jobs} at a time")
+
+    lock = threading.Lock()  # keeps progress lines whole
+    start = time.perf_counter()
+    warm = WarmPool(size=min(args.jobs, len(jobs)), cwd=REPO_ROOT) if args.warm else None
+    try:
+        with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+            futures = [
+                pool.submit(run_batch_job, job, dry_run=args.dry_run, timeout=args.timeout,
+                            game=Path(args.game_entry) if args.game else None,
+                            game_timeout=args.game_timeout, benchmark_frames=args.benchmark_frames, pool=warm)
+                for job in jobs
+            ]
+            for future in as_completed(futures):
+                job = future.result()
+                with lock:
+                    mark = "✅" if job.ok else "❌"
+                    game = "" if job.game_returncode is None else f" game={job.game_returncode}"
+                    if job.game_timed_out:
+                        game += " (timed out)"
+                    if job.game_metrics:
+                        game += f" p95={job.game_metrics['frame_ms_p95']:.1f}ms stutters={job.game_metrics['stutters']}"
+                    error = f" ({job.error})" if job.error else ""
+                    code = "timeout" if job.timed_out else job.returncode
+                    print(f"{mark} {job.agent} #{job.trial} [{job.trace_id}] code={code}{game} {job.duration_sec:.1f}s{error}")
+    finally:
+        if warm is not None:
+            warm.close()
+    wall = time.perf_counter() - start
+
+    failed = [j for j in jobs if not j.ok]
+    summary = {
+        "batch_id": batch_id,
+        "created_at": time.time(),
+        "dry_run": args.dry_run,
+        "trials": args.trials,
+        "concurrency": args.jobs,
+        "warm": args.warm,
+        "wall_sec": wall,
+        "sum_job_sec": sum(j.duration_sec for j in jobs),
+        "max_job_sec": max((j.duration_sec for j in jobs), default=0.0),
+        "ok": len(jobs) - len(failed),
+        "failed": len(failed),
+        "jobs": [asdict(j) for j in jobs],
+    }
+    path = write_batch(batch_id, summary)
+    print(f"\n{summary['ok']}/{len(jobs)} ok in {wall:.1f}s wall "
+          f"(jobs total {summary['sum_job_sec']:.1f}s, slowest {summary['max_job_sec']:.1f}s)")
+    print("summary:", path)
+    return 1 if failed else 0
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Run agents from agent_list/. No command = interactive menu.")
+    sub = ap.add_subparsers(dest="command")
+    batch = sub.add_parser("batch", help="run agents non-interactively in a worker pool")
+    batch.add_argument("agents", nargs="*", help="numbers, stems, module names or stem globs (default: all)")
+    batch.add_argument("-n", "--trials", type=int, default=1, help="runs per agent")
+    batch.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="runs at the same time")
+    batch.add_argument("--dry-run", action=argparse.BooleanOptionalAction, default=True,
+                       help="set CODERUNNERX_DRY_RUN for the agents (default: on)")
+    batch.add_argument("--warm", action=argparse.BooleanOptionalAction, default=True,
+                       help="launch agents on pre-started interpreters with the heavy imports done (default: on)")
+    batch.add_argument("--timeout", type=float, default=None, help="seconds before an agent run is killed")
+    batch.add_argument("--game", action="store_true", help="also run the game (headless) after each successful agent")
+    batch.add_argument("--game-entry", default=str(GAME_ENTRYPOINT), help="game script for --game")
+    batch.add_argument("--game-timeout", type=int, default=20)
+    batch.add_argument("--benchmark-frames", type=int, default=None,
+                       help="with --game: run the game's benchmark for this many frames instead of playing it")
+    args = ap.parse_args(argv)
+    if args.command == "batch" and (args.trials < 1 or args.jobs < 1):
+        ap.error("--trials and --jobs must be at least 1")
+    if args.command == "batch" and args.benchmark_frames is not None:
+        if not args.game:
+            ap.error("--benchmark-frames needs --game")
+        bench = Path(args.game_entry).resolve().parent / "bench_game.py"
+        if not bench.exists():
+            ap.error(f"--benchmark-frames: no bench_game.py next to {args.game_entry}")
+    return args
+
+
 def main() -> None:
+    args = parse_args(sys.argv[1:])
+    if args.command == "batch":
+        sys.exit(run_batch(args))
+
     try:
         print("Runner starting...")
         print_diagnostics()
@@ -157,8 +387,9 @@ def main() -> None:
         selected = choose_agent(agents)
         mod = pyfile_to_module(selected, REPO_ROOT)
 
-        # validate module is importable before running -m
-        if importlib.util.find_spec(mod) is None:
+        # validate module is importable before running -m (the index knows whether its folders are packages)
+        entry = agent_index().get(mod)
+        if entry is None or not entry.package:
             print(f"\n⚠ Module not importable via -m: {mod}")
             print("   (This usually means missing __init__.py in a package folder.)")
             print("   Will still try fallback to running the file directly.\n")
@@ -200,6 +431,12 @@ def main() -> None:
         print("timed_out:", result.timed_out)
         print("stdout_log:", result.stdout_log)
         print("stderr_log:", result.stderr_log)
+        if result.trace_path:
+            print("trace:", result.trace_path, "(open in chrome://tracing or ui.perfetto.dev)")
+        if result.metrics:
+            m = result.metrics
+            print(f"frames: {m['frames']}  frame ms mean {m['frame_ms_mean']:.2f} / p95 {m['frame_ms_p95']:.2f} / "
+                  f"p99 {m['frame_ms_p99']:.2f}  stutters: {m['stutters']}")
 
         # Surface stderr tail in console for fast debugging
         if result.stderr:
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from agent_runner_base.agent_runtime.launcher import PRELOAD, REPO_ROOT, WarmPool
+
+# -----------------------------
+# Agent start-up latency: cold vs warm
+# -----------------------------
+# Launches a stub agent that only imports the heavy modules and exits, first
+# as a fresh `python -m` (what run_module_with_fallback does without a pool),
+# then on a WarmPool whose workers preloaded the same modules. Launches are
+# sequential with a short untimed gap, like agents that take a while each,
+# so the pool has refilled before the next one.
+#
+#   python -m agent_runner_base.agent_runtime.bench_launcher --runs 20
+#   python -m agent_runner_base.agent_runtime.bench_launcher --imports asyncio,email.mime.multipart,http.client
+
+
+def available(modules: list[str]) -> tuple[list[str], list[str]]:
+    found, missing = [], []
+    for name in modules:
+        try:
+            ok = importlib.util.find_spec(name) is not None
+        except (ImportError, ValueError):
+            ok = False
+        (found if ok else missing).append(name)
+    return found, missing
+
+
+def summary(label: str, ms: list[float]) -> str:
+    ms = sorted(ms)
+    p95 = ms[min(len(ms) - 1, int(0.95 * len(ms)))]
+    return f"{label:<6} median {statistics.median(ms):7.1f} ms   p95 {p95:7.1f} ms   min {ms[0]:7.1f} ms"
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Cold vs warm agent launch latency.")
+    ap.add_argument("--runs", type=int, default=10)
+    ap.add_argument("--imports", default=",".join(PRELOAD), help="comma-separated modules the stub agent imports")
+    ap.add_argument("--gap", type=float, default=0.5, help="untimed seconds between launches")
+    args = ap.parse_args()
+
+    imports, missing = available([m for m in args.imports.split(",") if m])
+    if missing:
+        print("not installed, left out:", ", ".join(missing))
+    print("stub agent imports:", ", ".join(imports) or "(nothing)")
+
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO_ROOT), env.get("PYTHONPATH")]))
+    with tempfile.TemporaryDirectory() as tmp:
+        Path(tmp, "bench_stub_agent.py").write_text("".join(f"import {m}\n" for m in imports), encoding="utf-8")
+        cmd = ["-m", "bench_stub_agent"]
+
+        cold = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            code = subprocess.run([sys.executable, *cmd], cwd=tmp, env=env).returncode
+            cold.append((time.perf_counter() - start) * 1000)
+            if code:
+                print(f"stub agent failed (code={code})")
+                return 1
+            time.sleep(args.gap)
+
+        warm = []
+        with WarmPool(size=2, preload=imports) as pool:
+            time.sleep(args.gap)  # first workers finish their imports
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                code = pool.run(cmd, env, cwd=Path(tmp))
+                warm.append((time.perf_counter() - start) * 1000)
+                if code:
+                    print(f"stub agent failed on the pool (code={code})")
+                    return 1
+                time.sleep(args.gap)
+
+    print(summary("cold", cold))
+    print(summary("warm", warm))
+    print(f"speed-up (median): {statistics.median(cold) / statistics.median(warm):.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
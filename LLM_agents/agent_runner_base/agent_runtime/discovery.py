@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import ast
+import json
+import os
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from agent_runner_base.state.store import STATE_DIR, write_json_atomic
+
+# -----------------------------
+# Agent discovery index
+# -----------------------------
+# Instead of rglob("*.py") + find_spec on every launch, the runner keeps
+# state/agent_index.json: module -> file path, mtime and the agent's `name`
+# (read from the source with ast, never by importing it). refresh() stats
+# the directories it knows; only a directory whose mtime moved (a file was
+# added, removed or renamed in it) is listed again, and only the files in
+# it whose own mtime moved are parsed again. An agent edited in place
+# without touching its directory is caught when it is resolved.
+
+REPO_ROOT = Path(__file__).resolve().parents[2]  # .../LLM_agents
+AGENTS_DIR = REPO_ROOT / "agent_list"
+INDEX_PATH = STATE_DIR / "agent_index.json"
+INDEX_VERSION = 1
+
+
+@dataclass
+class AgentEntry:
+    module: str  # e.g. "agent_list.test_create_file"
+    path: str  # relative to the repo root, "/"-separated
+    mtime_ns: int
+    name: str | None  # the agent's `name` attribute, if it has one
+    package: bool  # every folder on the way has an __init__.py, so `python -m` can import it
+
+    @property
+    def stem(self) -> str:
+        return Path(self.path).stem
+
+    def file(self, repo_root: Path = REPO_ROOT) -> Path:
+        return repo_root / self.path
+
+
+def agent_name(path: Path) -> str | None:
+    """`name = "..."` on the first class that has one, else at module level; None if absent or unparsable."""
+    try:
+        tree = ast.parse(path.read_bytes(), filename=str(path))
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+    def name_in(body) -> str | None:
+        for stmt in body:
+            if (isinstance(stmt, ast.Assign) and isinstance(stmt.value, ast.Constant)
+                    and isinstance(stmt.value.value, str)
+                    and any(isinstance(t, ast.Name) and t.id == "name" for t in stmt.targets)):
+                return stmt.value.value
+        return None
+
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            found = name_in(node.body)
+            if found is not None:
+                return found
+    return name_in(tree.body)
+
+
+class AgentIndex:
+    def __init__(self, agents_dir: Path = AGENTS_DIR, repo_root: Path = REPO_ROOT, path: Path = INDEX_PATH):
+        self.agents_dir = Path(agents_dir)
+        self.repo_root = Path(repo_root)
+        self.path = Path(path)
+        self.dirs: dict[str, dict] = {}  # dir relative to the repo root -> {"mtime_ns", "subdirs", "package", "has_init"}
+        self.entries: dict[str, AgentEntry] = {}  # module -> entry
+        self._sorted: list[AgentEntry] | None = None
+        self._load()
+
+    # -----------------------------
+    # Persistence
+    # -----------------------------
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") != INDEX_VERSION or data.get("agents_dir") != str(self.agents_dir):
+            return  # other layout or other checkout: start over
+        self.dirs = data["dirs"]
+        self.entries = {m: AgentEntry(**e) for m, e in data["agents"].items()}
+
+    def save(self) -> None:
+        write_json_atomic(self.path, {
+            "version": INDEX_VERSION,
+            "agents_dir": str(self.agents_dir),
+            "dirs": self.dirs,
+            "agents": {m: asdict(e) for m, e in self.entries.items()},
+        })
+
+    # -----------------------------
+    # Incremental refresh
+    # -----------------------------
+    def _rel(self, path: Path) -> str:
+        return path.relative_to(self.repo_root).as_posix()
+
+    def refresh(self) -> bool:
+        """Bring the index up to date with agent_list/; saves and returns True if anything changed."""
+        changed = False
+        seen: set[str] = set()
+        todo = [(self.agents_dir, True)] if self.agents_dir.is_dir() else []
+        while todo:
+            folder, parent_package = todo.pop()
+            rel = self._rel(folder)
+            seen.add(rel)
+            try:
+                mtime_ns = folder.stat().st_mtime_ns
+            except OSError:
+                continue
+            known = self.dirs.get(rel)
+            if known is not None and known["mtime_ns"] == mtime_ns and known["package"] == parent_package:
+                package = parent_package and known["has_init"]
+                todo += [(self.repo_root / d, package) for d in known["subdirs"]]
+                continue
+            self._scan(folder, rel, mtime_ns, parent_package)
+            changed = True
+            package = self.dirs[rel]["package"] and self.dirs[rel]["has_init"]
+            todo += [(self.repo_root / d, package) for d in self.dirs[rel]["subdirs"]]
+
+        for rel in set(self.dirs) - seen:  # folder deleted (or agent_list itself gone)
+            del self.dirs[rel]
+            changed = True
+        gone = [m for m, e in self.entries.items() if Path(e.path).parent.as_posix() not in self.dirs]
+        for module in gone:
+            del self.entries[module]
+        if changed or gone:
+            self._sorted = None
+            self.save()
+        return changed or bool(gone)
+
+    def _scan(self, folder: Path, rel: str, mtime_ns: int, parent_package: bool) -> None:
+        """List one folder again: its agent files (re-parsed only if modified) and subfolders."""
+        files: dict[str, int] = {}
+        subdirs: list[str] = []
+        has_init = False
+        with os.scandir(folder) as it:
+            for e in it:
+                if e.is_dir():
+                    if e.name != "__pycache__":
+                        subdirs.append(f"{rel}/{e.name}")
+                elif e.name == "__init__.py":
+                    has_init = True
+                elif e.name.endswith(".py") and not e.name.startswith("_"):
+                    files[f"{rel}/{e.name}"] = e.stat().st_mtime_ns
+
+        for module, entry in list(self.entries.items()):
+            if Path(entry.path).parent.as_posix() == rel and entry.path not in files:
+                del self.entries[module]
+        package = parent_package and has_init  # `python -m` can import the files in here
+        for path, file_mtime in files.items():
+            module = ".".join(Path(path).with_suffix("").parts)
+            entry = self.entries.get(module)
+            if entry is None or entry.mtime_ns != file_mtime:
+                self.entries[module] = AgentEntry(module, path, file_mtime, agent_name(self.repo_root / path), package)
+            else:
+                entry.package = package
+        self.dirs[rel] = {"mtime_ns": mtime_ns, "subdirs": sorted(subdirs), "package": parent_package, "has_init": has_init}
+
+    def _fresh(self, entry: AgentEntry) -> AgentEntry | None:
+        """The entry, re-read if its file was edited in place; None (and a full refresh) if it's gone."""
+        try:
+            mtime_ns = entry.file(self.repo_root).stat().st_mtime_ns
+        except OSError:
+            self.refresh()
+            return None
+        if mtime_ns != entry.mtime_ns:
+            entry.mtime_ns = mtime_ns
+            entry.name = agent_name(entry.file(self.repo_root))
+            self.save()
+        return entry
+
+    # -----------------------------
+    # Lookups
+    # -----------------------------
+    def agents(self) -> list[AgentEntry]:
+        """All agents, ordered by path (the order of the runner's menu)."""
+        if self._sorted is None:
+            self._sorted = sorted(self.entries.values(), key=lambda e: Path(e.path))
+        return self._sorted
+
+    def get(self, module: str) -> AgentEntry | None:
+        entry = self.entries.get(module)
+        return None if entry is None else self._fresh(entry)
+
+    def resolve(self, selector: str) -> AgentEntry | None:
+        """An agent by menu number (1-based), module, file stem or `name` attribute."""
+        agents = self.agents()
+        if selector.isdigit():
+            n = int(selector)
+            return self._fresh(agents[n - 1]) if 1 <= n <= len(agents) else None
+        entry = self.entries.get(selector)
+        if entry is None:
+            entry = next((e for e in agents if e.stem == selector), None)
+        if entry is None:
+            entry = next((e for e in agents if e.name == selector), None)
+        return None if entry is None else self._fresh(entry)
+
+
+def load_index(**kwargs) -> AgentIndex:
+    """The index from state/, brought up to date."""
+    index = AgentIndex(**kwargs)
+    index.refresh()
+    return index
+
+
+if __name__ == "__main__":
+    # python -m agent_runner_base.agent_runtime.discovery [--rebuild]
+    if "--rebuild" in sys.argv[1:]:
+        INDEX_PATH.unlink(missing_ok=True)
+    for i, entry in enumerate(load_index().agents(), start=1):
+        print(f"{i:>3}. {entry.module:<50} {entry.name or '-'}")
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import struct
+from pathlib import Path
+
+# -----------------------------
+# Frame metrics from a game run
+# -----------------------------
+# Reader for the append-only binary file a game writes to GAME_METRICS_FILE
+# (the game side is game/PygameTest/20251024/frame_metrics.py; the layouts
+# must match):
+#   header  "GFM1", u16 version, u16 record size
+#   record  u32 frame, f32 frame_ms, f32 busy_ms, u32 active_tiles,
+#           u32 tiles_simulated, f32 fps
+# A record cut short by a killed game is ignored.
+
+MAGIC = b"GFM1"
+HEADER = struct.Struct("<4sHH")
+RECORD = struct.Struct("<IffIIf")
+
+STUTTER_FACTOR = 2.0  # a frame taking this many times the median frame time is a stutter
+
+
+def read_frame_metrics(path: Path) -> list[tuple] | None:
+    """Records as (frame, frame_ms, busy_ms, active_tiles, tiles_simulated, fps); None if missing or not a metrics file."""
+    try:
+        data = Path(path).read_bytes()
+    except OSError:
+        return None
+    if len(data) < HEADER.size:
+        return None
+    magic, version, size = HEADER.unpack_from(data)
+    if magic != MAGIC or version != 1 or size != RECORD.size:
+        return None
+    body = memoryview(data)[HEADER.size:]
+    body = body[:len(body) - len(body) % RECORD.size]
+    return list(RECORD.iter_unpack(body))
+
+
+def summarize_frame_metrics(path: Path, *, stutter_factor: float = STUTTER_FACTOR) -> dict | None:
+    """mean/p50/p95/p99/max frame time (ms), stutter count, fps and tile throughput; None without frames."""
+    records = read_frame_metrics(path)
+    if not records:
+        return None
+    n = len(records)
+    frame_ms = sorted(r[1] for r in records)
+    busy_ms = sorted(r[2] for r in records)
+
+    def pct(values: list[float], p: float) -> float:
+        return values[min(n - 1, int(p * n))]
+
+    median = pct(frame_ms, 0.50)
+    total_sec = sum(frame_ms) / 1000
+    tiles = sum(r[4] for r in records)
+    return {
+        "frames": n,
+        "frame_ms_mean": sum(frame_ms) / n,
+        "frame_ms_p50": median,
+        "frame_ms_p95": pct(frame_ms, 0.95),
+        "frame_ms_p99": pct(frame_ms, 0.99),
+        "frame_ms_max": frame_ms[-1],
+        "busy_ms_mean": sum(busy_ms) / n,
+        "busy_ms_p95": pct(busy_ms, 0.95),
+        "stutters": sum(ms > stutter_factor * median for ms in frame_ms),
+        "stutter_factor": stutter_factor,
+        "fps_mean": n / total_sec if total_sec else None,
+        "active_tiles_mean": sum(r[3] for r in records) / n,
+        "tiles_simulated": tiles,
+        "tiles_per_sec": tiles / total_sec if total_sec else None,
+    }
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable
+import json
 import os
 import subprocess
 import sys
+import threading
 import time
+import traceback
+
+from agent_runner_base.agent_runtime.frame_metrics import summarize_frame_metrics
 
 
 @dataclass
@@ -19,6 +26,43 @@ class RunResult:
     cwd: str
     stdout_log: str
     stderr_log: str
+    trace_path: str | None = None  # Chrome trace_event JSON from the game's profiler, if it wrote one
+    benchmark: dict | None = None  # bench_game.py results, for benchmark runs
+    stdout_lines: int = 0  # lines written in total (stdout/stderr above keep only the last tail_lines)
+    stderr_lines: int = 0
+    metrics_path: str | None = None  # binary per-frame metrics the game wrote (frame_metrics.py), if any
+    metrics: dict | None = None  # their summary: frame time mean/p95/p99, stutters, fps, tiles/s
+
+
+class _StreamCapture:
+    """One pipe copied line by line to its log file (line-buffered, readable while the game runs) on a thread."""
+
+    def __init__(self, pipe, log_path: Path, stream: str, tail_lines: int,
+                 on_line: Callable[[str, str], None] | None):
+        self.tail: deque[str] = deque(maxlen=tail_lines)
+        self.lines = 0
+        self._thread = threading.Thread(target=self._run, args=(pipe, log_path, stream, on_line), daemon=True)
+        self._thread.start()
+
+    def _run(self, pipe, log_path: Path, stream: str, on_line) -> None:
+        with open(log_path, "w", encoding="utf-8", buffering=1) as log:
+            for line in pipe:
+                log.write(line)
+                self.tail.append(line)
+                self.lines += 1
+                if on_line is not None:
+                    try:
+                        on_line(stream, line.rstrip("\n"))
+                    except Exception:  # a broken callback must not stall the pipe (and with it the game)
+                        traceback.print_exc()
+                        on_line = None
+        pipe.close()
+
+    def join(self, timeout: float) -> None:
+        self._thread.join(timeout)
+
+    def text(self) -> str:
+        return "".join(self.tail)
 
 
 def run_game_capture(
@@ -29,13 +73,30 @@ def run_game_capture(
     timeout_sec: int = 30,
     headless: bool = False,
     env_extra: dict[str, str] | None = None,
+    benchmark_frames: int | None = None,
+    tail_lines: int = 2000,
+    on_line: Callable[[str, str], None] | None = None,
 ) -> RunResult:
     """
     Run a python game entrypoint and capture stdout/stderr into:
       logs/run_<trace>.stdout.txt
       logs/run_<trace>.stderr.txt
 
-    Returns a RunResult with in-memory stdout/stderr as well.
+    The game is asked (via GAME_TRACE_FILE) to write its profiler timeline to
+      logs/run_<trace>.trace.json
+    (chrome://tracing / Perfetto / speedscope); its path ends up in RunResult.trace_path.
+    Likewise (via GAME_METRICS_FILE) its per-frame metrics to
+      logs/run_<trace>.metrics.bin
+    summarized into RunResult.metrics.
+
+    With benchmark_frames (headless only) the game is not played: the
+    bench_game.py next to the entrypoint runs that many scripted frames and
+    its JSON (also kept as logs/run_<trace>.bench.json) lands in RunResult.benchmark.
+
+    Both pipes are streamed to the log files as the game writes them, so a
+    run killed on timeout still leaves everything it printed. RunResult.stdout/
+    stderr hold only the last tail_lines lines of each. on_line(stream, line),
+    with stream "stdout" or "stderr", sees every line live (from reader threads).
     """
     entrypoint = Path(entrypoint).resolve()
     cwd = Path(cwd).resolve()
@@ -52,11 +113,26 @@ def run_game_capture(
         env.setdefault("SDL_VIDEODRIVER", "dummy")
         env.setdefault("SDL_AUDIODRIVER", "dummy")
 
-    # Unbuffered so we can capture output promptly
-    cmd = [sys.executable, "-u", str(entrypoint)]
-
     out_file = logs_dir / f"run_{trace_id}.stdout.txt"
     err_file = logs_dir / f"run_{trace_id}.stderr.txt"
+    bench_file = logs_dir / f"run_{trace_id}.bench.json"
+
+    # Unbuffered so we can capture output promptly
+    cmd = [sys.executable, "-u", str(entrypoint)]
+    if benchmark_frames is not None:
+        if not headless:
+            raise ValueError("benchmark runs are headless: pass headless=True")
+        bench_script = entrypoint.parent / "bench_game.py"
+        if not bench_script.exists():
+            raise FileNotFoundError(f"no benchmark entry point next to the game: {bench_script}")
+        bench_file.unlink(missing_ok=True)
+        cmd = [sys.executable, "-u", str(bench_script), "--frames", str(benchmark_frames), "--out", str(bench_file)]
+    trace_file = logs_dir / f"run_{trace_id}.trace.json"
+    trace_file.unlink(missing_ok=True)
+    env.setdefault("GAME_TRACE_FILE", str(trace_file))
+    metrics_file = logs_dir / f"run_{trace_id}.metrics.bin"
+    metrics_file.unlink(missing_ok=True)  # append-only: don't extend an earlier run with this trace id
+    env.setdefault("GAME_METRICS_FILE", str(metrics_file))
 
     start = time.time()
     timed_out = False
@@ -68,30 +144,44 @@ def run_game_capture(
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         text=True,
+        encoding="utf-8",
+        errors="replace",
     )
+    out = _StreamCapture(proc.stdout, out_file, "stdout", tail_lines, on_line)
+    err = _StreamCapture(proc.stderr, err_file, "stderr", tail_lines, on_line)
 
     try:
-        stdout, stderr = proc.communicate(timeout=timeout_sec)
+        proc.wait(timeout=timeout_sec)
     except subprocess.TimeoutExpired:
         timed_out = True
-        proc.kill()
-        stdout, stderr = proc.communicate()
+        # SIGTERM first so the game can flush its trace; hard kill if it doesn't exit
+        # (on Windows terminate() is already a hard kill)
+        proc.terminate()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+    out.join(timeout=5)  # a grandchild still holding the pipe must not hang us
+    err.join(timeout=5)
 
     duration = time.time() - start
     returncode = proc.returncode if proc.returncode is not None else -1
 
-    # Persist logs
-    out_file.write_text(stdout or "", encoding="utf-8")
-    err_file.write_text(stderr or "", encoding="utf-8")
-
     return RunResult(
         returncode=returncode,
         duration_sec=duration,
-        stdout=stdout or "",
-        stderr=stderr or "",
+        stdout=out.text(),
+        stderr=err.text(),
         timed_out=timed_out,
         cmd=cmd,
         cwd=str(cwd),
         stdout_log=str(out_file),
         stderr_log=str(err_file),
+        trace_path=str(trace_file) if trace_file.exists() else None,
+        benchmark=json.loads(bench_file.read_text(encoding="utf-8")) if benchmark_frames is not None and bench_file.exists() else None,
+        stdout_lines=out.lines,
+        stderr_lines=err.lines,
+        metrics_path=str(metrics_file) if metrics_file.exists() else None,
+        metrics=summarize_frame_metrics(metrics_file),
     )
\ No newline at end of file
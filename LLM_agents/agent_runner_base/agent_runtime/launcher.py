@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import queue
+import runpy
+import subprocess
+import sys
+import threading
+import traceback
+from pathlib import Path
+
+# -----------------------------
+# Warm agent launches
+# -----------------------------
+# A cold `python -m agent` pays for interpreter start-up plus importing dotenv,
+# openai, httpx, pydantic ... before the agent does anything. WarmPool keeps
+# `size` worker interpreters that have already done those imports and are
+# blocked waiting for a job. A launch hands one of them the job (module or
+# file, env, cwd, log files) and starts a replacement in the background.
+# Each worker runs exactly one job and exits, so every agent still gets a
+# fresh process: its own os.environ (TRACE_ID etc.), cwd, sys.argv and exit
+# code, with stdout/stderr inherited or redirected to the given files. The
+# one difference to a cold launch: the worker's stdin is the job pipe, so
+# agents that read from stdin see EOF.
+
+REPO_ROOT = Path(__file__).resolve().parents[2]  # .../LLM_agents
+
+PRELOAD = ["dotenv", "openai", "httpx", "pydantic", "agent_runner_base.base"]
+
+
+def _redirect(fd: int, path: str | None) -> None:
+    if not path:
+        return
+    target = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    os.dup2(target, fd)
+    os.close(target)
+
+
+def _exit_code(code) -> int:
+    """Same mapping the interpreter applies to SystemExit."""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def run_job(job: dict) -> int:
+    """Run one job in this process, the way `python -m <module>` / `python <file>` would."""
+    os.environ.clear()
+    os.environ.update(job["env"])
+    os.chdir(job["cwd"])
+    sys.stdout.flush()
+    sys.stderr.flush()
+    _redirect(1, job.get("stdout"))
+    _redirect(2, job.get("stderr"))
+    try:
+        if job.get("module"):
+            sys.path[0] = job["cwd"]
+            sys.argv = [""]  # run_module fills in argv[0]
+            runpy.run_module(job["module"], run_name="__main__", alter_sys=True)
+        else:
+            path = job["file"]
+            sys.path[0] = os.path.dirname(os.path.abspath(path))
+            sys.argv = [path]
+            runpy.run_path(path, run_name="__main__")
+        return 0
+    except SystemExit as e:
+        return _exit_code(e.code)
+    except BaseException:
+        traceback.print_exc()
+        return 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+
+def worker_main(preload: list[str]) -> int:
+    """Import the heavy modules, then wait for one job on stdin and run it."""
+    for name in preload:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass  # not installed / broken: the agent will import it itself (or fail like it would cold)
+    line = sys.stdin.readline()
+    if not line:
+        return 0  # pool closed before we got a job
+    return run_job(json.loads(line))
+
+
+class WarmPool:
+    """Pre-started worker interpreters for agent launches; see the notes at the top of this module."""
+
+    def __init__(self, size: int = 2, *, preload: list[str] | None = None, cwd: Path = REPO_ROOT):
+        self.size = size
+        self.preload = PRELOAD if preload is None else preload
+        self.cwd = Path(cwd)
+        self._idle: queue.Queue[subprocess.Popen] = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()  # no new workers once close() started
+        for _ in range(size):
+            self._spawn()
+
+    def _spawn(self) -> None:
+        cmd = [sys.executable, "-m", "agent_runner_base.agent_runtime.launcher", "--worker", *self.preload]
+        with self._lock:
+            if not self._closed:
+                self._idle.put(subprocess.Popen(cmd, cwd=str(self.cwd), stdin=subprocess.PIPE, text=True))
+
+    def _take(self) -> subprocess.Popen:
+        while True:
+            proc = self._idle.get()
+            if proc.poll() is None:
+                return proc
+            self._spawn()  # died while idle
+
+    def launch(self, job: dict, *, timeout: float | None = None) -> int:
+        """Run a job dict (see run_job) on a warm worker and return its exit code."""
+        proc = self._take()
+        threading.Thread(target=self._spawn, daemon=True).start()  # keep the pool full
+        proc.stdin.write(json.dumps(job) + "\n")
+        proc.stdin.close()
+        try:
+            return proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            raise
+
+    def run(self, args: list[str], env: dict, *, cwd: Path | None = None, stdout=None, stderr=None,
+            timeout: float | None = None) -> int:
+        """
+        Warm equivalent of subprocess.run([python, *args], cwd=cwd, env=env, stdout=stdout,
+        stderr=stderr, timeout=timeout).returncode, for args ["-m", module] or [path].
+        Raises subprocess.TimeoutExpired (after killing the worker) like subprocess.run.
+        """
+        if len(args) == 2 and args[0] == "-m":
+            target = {"module": args[1]}
+        elif len(args) == 1:
+            target = {"file": str(args[0])}
+        else:
+            raise ValueError(f"unsupported launch: {args!r}")
+        return self.launch(self._job(env, cwd, stdout, stderr, **target), timeout=timeout)
+
+    def _job(self, env, cwd, stdout, stderr, **target) -> dict:
+        # stdout/stderr: None (inherit), a path, or an open file (its path is used, appended to)
+        def path_of(f):
+            return None if f is None else str(getattr(f, "name", f))
+
+        if stdout is not None and hasattr(stdout, "flush"):
+            stdout.flush()
+        if stderr is not None and hasattr(stderr, "flush"):
+            stderr.flush()
+        return {"env": dict(env), "cwd": str(cwd or self.cwd), "stdout": path_of(stdout), "stderr": path_of(stderr), **target}
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                proc = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            proc.stdin.close()  # EOF: worker exits without a job
+            proc.wait()
+
+    def __enter__(self) -> "WarmPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "--worker":
+        sys.exit(worker_main(sys.argv[2:]))
+    print("usage: python -m agent_runner_base.agent_runtime.launcher --worker [module ...]", file=sys.stderr)
+    sys.exit(2)
@@ -100,11 +100,14 @@ def safe_write_text(path: Path, content: str, *, allow_roots: list[Path] | None
 # -----------------------------
 # Run a child agent (module)
 # -----------------------------
-def run_child(module: str) -> int:
+def run_child(module: str, *, pool=None) -> int:
     """
     Runs: python -m <module> from repo root so imports work.
     Example module: "Agent.agents.scanner_agent"
+    pool: an agent_runtime.launcher.WarmPool to run it on a pre-started interpreter.
     """
+    if pool is not None:
+        return pool.run(["-m", module], dict(os.environ), cwd=REPO_ROOT)
     proc = subprocess.run([sys.executable, "-m", module], cwd=str(REPO_ROOT), check=False)
     return proc.returncode
 
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import json
+import os
+import threading
 import time
 from dataclasses import asdict, is_dataclass
 from pathlib import Path
@@ -15,6 +17,8 @@ STATE_DIR.mkdir(parents=True, exist_ok=True)
 RUNS_DIR = STATE_DIR / "runs"
 RUNS_DIR.mkdir(parents=True, exist_ok=True)
 
+BATCHES_DIR = STATE_DIR / "batches"
+
 LAST_RUN_PATH = STATE_DIR / "last_run.json"
 
 
@@ -31,7 +35,8 @@ def _json_default(o: Any) -> Any:
 
 def write_json_atomic(path: Path, obj: Any) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    tmp = path.with_suffix(path.suffix + ".tmp")
+    # per-writer tmp name: batch runs finish concurrently and all replace last_run.json
+    tmp = path.with_suffix(f"{path.suffix}.{os.getpid()}.{threading.get_ident()}.tmp")
     tmp.write_text(json.dumps(obj, ensure_ascii=False, indent=2, default=_json_default), encoding="utf-8")
     tmp.replace(path)
 
@@ -104,6 +109,13 @@ def write_run(
     return run_path
 
 
+def write_batch(batch_id: str, summary: dict) -> Path:
+    """Writes a batch summary (one entry per agent run) under state/batches/<batch_id>.json"""
+    path = BATCHES_DIR / f"{batch_id}.json"
+    write_json_atomic(path, summary)
+    return path
+
+
 def read_last_run() -> Optional[dict]:
     if not LAST_RUN_PATH.exists():
         return None
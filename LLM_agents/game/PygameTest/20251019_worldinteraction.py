@@ -15,10 +15,6 @@ TILE_SIZE = 16
 MAP_WIDTH, MAP_HEIGHT = 150, 150
 FPS = 60
 
-pygame.init()
-window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-clock = pygame.time.Clock()
-
 # ==========================================================
 # == CAMERA CLASS
 # ==========================================================
@@ -42,6 +38,41 @@ class Camera:
         self.pos.y = target_rect.centery - WINDOW_HEIGHT / (2 * self.zoom)
         self.zoom += (self.target_zoom - self.zoom) * 0.12
 
+# ==========================================================
+# == TILE LAYERS
+# ==========================================================
+class TileLayer:
+    """One map layer: tile rects keyed by tile coordinate, so add/remove/lookup are O(1)."""
+    def __init__(self):
+        self.tiles = {}  # (tx, ty) -> rect
+
+    def add(self, key):
+        if key in self.tiles:
+            return False
+        self.tiles[key] = pygame.Rect(key[0]*TILE_SIZE, key[1]*TILE_SIZE, TILE_SIZE, TILE_SIZE)
+        return True
+
+    def remove(self, key):
+        return self.tiles.pop(key, None) is not None
+
+    def __contains__(self, key):
+        return key in self.tiles
+
+    def __len__(self):
+        return len(self.tiles)
+
+    def __iter__(self):
+        return iter(self.tiles.values())
+
+    def query(self, rect):
+        """Rects of this layer overlapping rect (pixels); only looks at the tiles under it."""
+        x0, x1 = rect.left//TILE_SIZE, (rect.right-1)//TILE_SIZE + 1
+        y0, y1 = rect.top//TILE_SIZE, (rect.bottom-1)//TILE_SIZE + 1
+        if (x1-x0) * (y1-y0) > len(self.tiles):  # huge area, sparse layer: scan the layer instead
+            return [r for (x, y), r in self.tiles.items() if x0 <= x < x1 and y0 <= y < y1]
+        tiles = self.tiles
+        return [tiles[(x, y)] for y in range(y0, y1) for x in range(x0, x1) if (x, y) in tiles]
+
 # ==========================================================
 # == PLAYER CLASS
 # ==========================================================
@@ -76,14 +107,15 @@ class Player:
         self.rect = self.swept_aabb(vel, obstacles)
 
     def swept_aabb(self, velocity, obstacles):
+        # obstacles is a TileLayer: only the tiles under the moved rect are tested
         new_rect = self.rect.copy()
         new_rect.x += velocity.x
-        for obs in obstacles:
+        for obs in obstacles.query(new_rect):
             if new_rect.colliderect(obs):
                 if velocity.x > 0: new_rect.right = obs.left
                 elif velocity.x < 0: new_rect.left = obs.right
         new_rect.y += velocity.y
-        for obs in obstacles:
+        for obs in obstacles.query(new_rect):
             if new_rect.colliderect(obs):
                 if velocity.y > 0: new_rect.bottom = obs.top
                 elif velocity.y < 0: new_rect.top = obs.bottom
@@ -97,7 +129,7 @@ class Player:
 # ==========================================================
 class WorldMap:
     def __init__(self):
-        self.layers = {"water":[], "grass":[], "trees":[], "temperature":{}, "obstacles":[]}
+        self.layers = {"water":TileLayer(), "grass":TileLayer(), "trees":TileLayer(), "temperature":{}, "obstacles":TileLayer()}
         self.noise = PerlinNoise(octaves=4, seed=random.randint(0,99999))
         self.generate()
 
@@ -111,54 +143,51 @@ class WorldMap:
                 e = self.noise([nx, ny])
                 dist = math.hypot(x-cx, y-cy)/radius
                 value = e - dist
-                r = pygame.Rect(x*TILE_SIZE, y*TILE_SIZE, TILE_SIZE, TILE_SIZE)
                 temp = random.uniform(270, 320)
                 self.layers['temperature'][(x,y)] = temp
                 if value < -0.05:
-                    self.layers['water'].append(r)
+                    self.layers['water'].add((x,y))
                 elif value < 0.15:
-                    self.layers['grass'].append(r)
+                    self.layers['grass'].add((x,y))
                     if random.random()<0.04:
-                        self.layers['trees'].append(r.copy())
-                        self.layers['obstacles'].append(r.copy())
+                        add_tree(self.layers, (x,y))
                 else:
-                    self.layers['trees'].append(r.copy())
-                    self.layers['obstacles'].append(r.copy())
+                    add_tree(self.layers, (x,y))
 
     def draw(self, surf, cam):
         # Only draw tiles that are visible to camera (culling)
         visible_rect = pygame.Rect(cam.pos.x, cam.pos.y, WINDOW_WIDTH/cam.zoom, WINDOW_HEIGHT/cam.zoom)
         for name in ['water','grass','trees']:
             color = {'water':(10,40,160),'grass':(68,170,68),'trees':(16,90,16)}[name]
-            for r in self.layers[name]:
-                if r.colliderect(visible_rect):
-                    surf.fill(color, cam.apply(r))
+            for r in self.layers[name].query(visible_rect):
+                surf.fill(color, cam.apply(r))
 
 # ==========================================================
 # == PLAYER WORLD INTERACTION
 # ==========================================================
+def add_tree(layers, key):
+    layers['trees'].add(key)
+    layers['obstacles'].add(key)
+
+def remove_tree(layers, key):
+    layers['obstacles'].remove(key)
+    return layers['trees'].remove(key)
+
 def interact(player, layers, action):
     px, py = int(player.rect.centerx//TILE_SIZE), int(player.rect.centery//TILE_SIZE)
     key = (px, py)
     if action == "plant":
-        rect = pygame.Rect(px*TILE_SIZE, py*TILE_SIZE, TILE_SIZE, TILE_SIZE)
-        if rect not in layers['trees']:
-            layers['trees'].append(rect)
-            layers['obstacles'].append(rect)
+        if key not in layers['trees']:
+            add_tree(layers, key)
             print(f"Planted tree at {key}")
     elif action == "cut":
-        for tree in layers['trees']:
-            if tree.collidepoint(player.rect.center):
-                layers['trees'].remove(tree)
-                if tree in layers['obstacles']: layers['obstacles'].remove(tree)
-                print(f"Cut tree at {key}")
-                break
+        if remove_tree(layers, key):
+            print(f"Cut tree at {key}")
     elif action == "heat":
         if key in layers['temperature']:
             layers['temperature'][key] += 5
             if layers['temperature'][key] > 330:
-                layers['trees'] = [t for t in layers['trees'] if not t.collidepoint(player.rect.center)]
-                layers['obstacles'] = [t for t in layers['obstacles'] if not t.collidepoint(player.rect.center)]
+                remove_tree(layers, key)
                 print(f"🔥 Tree burned at {key}")
 
 # ==========================================================
@@ -182,54 +211,63 @@ def draw_minimap(surf, player, layers):
 # ==========================================================
 # == MAIN LOOP
 # ==========================================================
-player = Player((MAP_WIDTH*TILE_SIZE//2, MAP_HEIGHT*TILE_SIZE//2))
-cam = Camera()
-world = WorldMap()
-
-joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
-for js in joysticks: js.init()
-
-running = True
-action = None
-frame_times = []
-perf_timer = 0
-max_frame_time = 0
-PERF_INTERVAL = 3.0
-
-while running:
-    dt = clock.tick(FPS)
-    perf_timer += dt/1000.0
-    frame_times.append(dt)
-    if dt > max_frame_time: max_frame_time = dt
-
-    keys = pygame.key.get_pressed()
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT: running = False
-        elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_1: action = "plant"
-            elif event.key == pygame.K_2: action = "cut"
-            elif event.key == pygame.K_3: action = "heat"
-        elif event.type == pygame.MOUSEWHEEL:
-            cam.target_zoom *= 1.0 + event.y*0.1
-
-    joystick = joysticks[0] if joysticks else None
-    move = player.handle_input(keys, joystick)
-    player.update(dt, move, world.layers['obstacles'])
-    cam.update(player.rect)
-
-    if action:
-        interact(player, world.layers, action)
-        action = None
-
-    window.fill((8,10,30))
-    world.draw(window, cam)
-    player.draw(window, cam)
-    draw_minimap(window, player, world.layers)
-    pygame.display.flip()
-
-    if perf_timer >= PERF_INTERVAL:
-        print(f"[Performance Spike] max frame time in last {PERF_INTERVAL}s: {max_frame_time:.2f} ms")
-        perf_timer = 0
-        max_frame_time = 0
-
-pygame.quit()
+def main():
+    pygame.init()
+    window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    clock = pygame.time.Clock()
+
+    player = Player((MAP_WIDTH*TILE_SIZE//2, MAP_HEIGHT*TILE_SIZE//2))
+    cam = Camera()
+    world = WorldMap()
+
+    joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
+    for js in joysticks: js.init()
+
+    running = True
+    action = None
+    frame_times = []
+    perf_timer = 0
+    max_frame_time = 0
+    PERF_INTERVAL = 3.0
+
+    while running:
+        dt = clock.tick(FPS)
+        perf_timer += dt/1000.0
+        frame_times.append(dt)
+        if dt > max_frame_time: max_frame_time = dt
+
+        keys = pygame.key.get_pressed()
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT: running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_1: action = "plant"
+                elif event.key == pygame.K_2: action = "cut"
+                elif event.key == pygame.K_3: action = "heat"
+            elif event.type == pygame.MOUSEWHEEL:
+                cam.target_zoom *= 1.0 + event.y*0.1
+
+        joystick = joysticks[0] if joysticks else None
+        move = player.handle_input(keys, joystick)
+        player.update(dt, move, world.layers['obstacles'])
+        cam.update(player.rect)
+
+        if action:
+            interact(player, world.layers, action)
+            action = None
+
+        window.fill((8,10,30))
+        world.draw(window, cam)
+        player.draw(window, cam)
+        draw_minimap(window, player, world.layers)
+        pygame.display.flip()
+
+        if perf_timer >= PERF_INTERVAL:
+            print(f"[Performance Spike] max frame time in last {PERF_INTERVAL}s: {max_frame_time:.2f} ms")
+            perf_timer = 0
+            max_frame_time = 0
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
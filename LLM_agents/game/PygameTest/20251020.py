@@ -42,6 +42,16 @@ class Camera:
         self.pos.y = target_rect.centery - WINDOW_HEIGHT / (2 * self.zoom)
         self.zoom += (self.target_zoom - self.zoom) * 0.12
 
+# ==========================================================
+# == COLLISION
+# ==========================================================
+def obstacles_near(obstacles, rect):
+    """Obstacle rects under rect; obstacles is {(tx, ty): rect}, so only the tiles it covers are looked up."""
+    return [obstacles[(x, y)]
+            for y in range(rect.top//TILE_SIZE, (rect.bottom-1)//TILE_SIZE + 1)
+            for x in range(rect.left//TILE_SIZE, (rect.right-1)//TILE_SIZE + 1)
+            if (x, y) in obstacles]
+
 # ==========================================================
 # == PLAYER CLASS
 # ==========================================================
@@ -76,14 +86,15 @@ class Player:
         self.rect = self.swept_aabb(vel, obstacles)
 
     def swept_aabb(self, velocity, obstacles):
+        # obstacles are keyed by tile: only the tiles under the moved rect are tested
         new_rect = self.rect.copy()
         new_rect.x += velocity.x
-        for obs in obstacles:
+        for obs in obstacles_near(obstacles, new_rect):
             if new_rect.colliderect(obs):
                 if velocity.x > 0: new_rect.right = obs.left
                 elif velocity.x < 0: new_rect.left = obs.right
         new_rect.y += velocity.y
-        for obs in obstacles:
+        for obs in obstacles_near(obstacles, new_rect):
             if new_rect.colliderect(obs):
                 if velocity.y > 0: new_rect.bottom = obs.top
                 elif velocity.y < 0: new_rect.top = obs.bottom
@@ -97,7 +108,7 @@ class Player:
 # ==========================================================
 class WorldMap:
     def __init__(self):
-        self.layers = {"water":[], "grass":[], "trees":[], "temperature":{}, "obstacles":[]}
+        self.layers = {"water":[], "grass":[], "trees":{}, "temperature":{}, "obstacles":{}}  # trees, obstacles: (tx, ty) -> rect
         self.noise = PerlinNoise(octaves=4, seed=random.randint(0,99999))
         self.generate()
 
@@ -119,21 +130,29 @@ class WorldMap:
                 elif value < 0.15:
                     self.layers['grass'].append(r)
                     if random.random()<0.04:
-                        self.layers['trees'].append(r.copy())
-                        self.layers['obstacles'].append(r.copy())
+                        self.add_tree(r)
                 else:
-                    self.layers['trees'].append(r.copy())
-                    self.layers['obstacles'].append(r.copy())
+                    self.add_tree(r)
+
+    def add_tree(self, r):
+        key = (r.x//TILE_SIZE, r.y//TILE_SIZE)
+        self.layers['trees'][key] = r.copy()
+        self.layers['obstacles'][key] = r.copy()
 
     def draw(self, surf, cam):
         # Only draw tiles that are visible to camera (culling)
         visible_rect = pygame.Rect(cam.pos.x, cam.pos.y, WINDOW_WIDTH/cam.zoom, WINDOW_HEIGHT/cam.zoom)
         for name in ['water','grass','trees']:
             color = {'water':(10,40,160),'grass':(68,170,68),'trees':(16,90,16)}[name]
-            for r in self.layers[name]:
+            for r in layer_rects(self.layers, name):
                 if r.colliderect(visible_rect):
                     surf.fill(color, cam.apply(r))
 
+def layer_rects(layers, name):
+    """Rects of a layer: a list, or for the tile-keyed ones (trees) the dict's values."""
+    rects = layers[name]
+    return rects.values() if isinstance(rects, dict) else rects
+
 # ==========================================================
 # == PLAYER WORLD INTERACTION
 # ==========================================================
@@ -142,23 +161,20 @@ def interact(player, layers, action):
     key = (px, py)
     if action == "plant":
         rect = pygame.Rect(px*TILE_SIZE, py*TILE_SIZE, TILE_SIZE, TILE_SIZE)
-        if rect not in layers['trees']:
-            layers['trees'].append(rect)
-            layers['obstacles'].append(rect)
+        if key not in layers['trees']:
+            layers['trees'][key] = rect
+            layers['obstacles'][key] = rect
             print(f"Planted tree at {key}")
     elif action == "cut":
-        for tree in layers['trees']:
-            if tree.collidepoint(player.rect.center):
-                layers['trees'].remove(tree)
-                if tree in layers['obstacles']: layers['obstacles'].remove(tree)
-                print(f"Cut tree at {key}")
-                break
+        if layers['trees'].pop(key, None) is not None:
+            layers['obstacles'].pop(key, None)
+            print(f"Cut tree at {key}")
     elif action == "heat":
         if key in layers['temperature']:
             layers['temperature'][key] += 5
             if layers['temperature'][key] > 330:
-                layers['trees'] = [t for t in layers['trees'] if not t.collidepoint(player.rect.center)]
-                layers['obstacles'] = [t for t in layers['obstacles'] if not t.collidepoint(player.rect.center)]
+                layers['trees'].pop(key, None)
+                layers['obstacles'].pop(key, None)
                 print(f"🔥 Tree burned at {key}")
 
 # ==========================================================
@@ -170,7 +186,7 @@ def draw_minimap(surf, player, layers):
     minimap.fill((10,10,30))
     for name in ['water','grass','trees']:
         color = {'water':(10,40,160),'grass':(68,170,68),'trees':(16,90,16)}[name]
-        for r in layers[name]:
+        for r in layer_rects(layers, name):
             x = int(r.x * mm_w / (MAP_WIDTH*TILE_SIZE))
             y = int(r.y * mm_h / (MAP_HEIGHT*TILE_SIZE))
             minimap.fill(color, (x, y, 2, 2))
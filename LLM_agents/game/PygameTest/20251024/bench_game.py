@@ -0,0 +1,191 @@
+# -------------------- bench_game.py --------------------
+# Headless, deterministic run of the game's systems (World, Rendering, Camera,
+# Player, MiniMap) for a fixed number of frames: same seed, same scripted
+# movement / zoom / edits, fixed frame time, no window and no controller.
+# Prints (or writes) JSON with per-system percentiles, tiles simulated per
+# second and peak RSS. With GAME_METRICS_FILE set it also writes the same
+# per-frame metrics channel as main.py (frame_ms == busy_ms here: no tick wait).
+#
+#   python bench_game.py --frames 600
+#   python bench_game.py --backend python --frames 300 --out logs/bench.json
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse, json, math, platform, sys, time
+
+import pygame
+
+import config
+from camera import Camera
+from frame_metrics import FrameMetrics
+from mini_map import MiniMap
+from player import Player
+from profiler import Profiler
+from rendering import Rendering
+from timestep import FixedTimestep
+from world import create_world
+
+SYSTEMS = ("world_update", "player_update", "camera_update", "render", "minimap", "frame")
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process, or None if the platform can't tell."""
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024  # bytes on macOS, KiB elsewhere
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize
+    return None
+
+
+def scripted_input(frame, frames, max_zoom_out):
+    """Movement direction, zoom target and whether to edit the tile under the player, for one frame."""
+    t = frame / max(1, frames)
+    angle = 2 * math.pi * 3 * t  # three loops over the run
+    move = pygame.Vector2(math.cos(angle), math.sin(angle))
+    # 1.0 down to max_zoom_out (whole map on screen) and back, twice, evenly in log scale;
+    # on a map much wider than the window the far end picks the coarse LOD levels
+    zoom = max_zoom_out ** (0.5 - 0.5 * math.cos(2 * math.pi * 2 * t))
+    edit = +0.25 if frame % 20 == 0 else (-0.25 if frame % 20 == 10 else 0.0)
+    return move, zoom, edit
+
+
+def run(frames, backend, seed, size, render_mode, minimap):
+    pygame.init()
+    window = pygame.display.set_mode((config.WINDOW_WIDTH, config.WINDOW_HEIGHT))
+    profiler = Profiler(window=frames, report_ms=1e9, trace_events=config.PROFILE_TRACE_EVENTS)
+    world = create_world(size, size, backend, seed)
+    player = Player((size * config.TILE_SIZE // 2, size * config.TILE_SIZE // 2))
+    if backend == "chunked":
+        world.focus_on(int(player.rect.centerx // config.TILE_SIZE), int(player.rect.centery // config.TILE_SIZE))
+    cam = Camera()
+    cam.fit_map(size, size)
+    render = Rendering(profiler, mode=render_mode)
+    mini = MiniMap(world) if minimap else None
+    if mini is not None:
+        mini.create_mini_map()
+    timestep = FixedTimestep(config.SIM_HZ, config.MAX_CATCHUP_TICKS)
+    budget = world.step_limit
+    frame_ms = 1000.0 / config.FPS  # fixed, so every run steps the same ticks
+    metrics = FrameMetrics(config.METRICS_FILE) if config.METRICS_FILE else None
+
+    tiles_simulated = 0
+    tiles_recorded = 0  # tiles_simulated as of the last metrics record
+    start = time.perf_counter()
+    for frame in range(frames):
+        profiler.start("frame")
+        move, zoom, edit = scripted_input(frame, frames, cam.max_zoom_out)
+        cam.target_zoom = zoom
+        if edit:
+            world.edit_nature(int(player.rect.centerx // config.TILE_SIZE), int(player.rect.centery // config.TILE_SIZE), edit)
+
+        for _ in range(timestep.advance(frame_ms)):
+            profiler.start("player_update")
+            player.update(timestep.step_ms, move, None, world)
+            profiler.stop("player_update")
+
+            profiler.start("world_update")
+            if backend == "chunked":
+                world.focus_on(int(player.rect.centerx // config.TILE_SIZE), int(player.rect.centery // config.TILE_SIZE))
+            sweeps = world.sweeps
+            world.simulate_step(budget)
+            profiler.stop("world_update")
+            if world.sweeps != sweeps:
+                tiles_simulated += world.active_count  # tiles the finished sweep stepped
+        player.interpolate(timestep.alpha)
+
+        profiler.start("camera_update")
+        cam.update(player.draw_rect)
+        profiler.stop("camera_update")
+
+        profiler.start("render")
+        if config.DIRTY_RECTS:
+            dirty = render.draw_frame(window, cam, world, player)
+        else:
+            window.fill(config.BACKGROUND_COLOR)
+            render.draw_non_player(window, cam, world)
+            player.draw(window, cam)
+            dirty = [window.get_rect()]
+        profiler.stop("render")
+
+        if mini is not None:
+            profiler.start("minimap")
+            covered = mini.draw(window, player_rect=player.draw_rect)
+            profiler.stop("minimap")
+            render.mark_dirty(covered)
+            dirty.append(covered)
+        pygame.display.update(dirty)
+        profiler.stop("frame")
+        profiler.end_frame()
+        if metrics:
+            busy = profiler.last("frame")
+            metrics.record(busy, busy, world.active_count, tiles_simulated - tiles_recorded, 1000.0 / busy if busy else 0.0)
+            tiles_recorded = tiles_simulated
+    if metrics:
+        metrics.close()
+    elapsed = time.perf_counter() - start
+    if config.PROFILE_TRACE_EVENTS:
+        profiler.write_trace(config.PROFILE_TRACE_FILE)
+
+    world_sec = sum(profiler.sections["world_update"].samples) / 1e9  # window == frames: every frame
+    if hasattr(world, "close"):
+        world.close()
+    pygame.quit()
+    return {
+        "config": {"frames": frames, "backend": backend, "seed": seed, "map_size": size,
+                   "render_mode": render_mode, "minimap": minimap, "frame_ms": frame_ms},
+        "systems": {name: profiler.stats(name) for name in SYSTEMS if name in profiler.sections},
+        "ticks": timestep.total_ticks,
+        "tiles_simulated": tiles_simulated,
+        "tiles_per_sec": tiles_simulated / world_sec if world_sec else None,
+        "wall_sec": elapsed,
+        "fps": frames / elapsed if elapsed else None,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Headless deterministic benchmark of the game systems.")
+    ap.add_argument("--frames", type=int, default=600)
+    ap.add_argument("--backend", default=config.SIM_BACKEND, choices=["python", "numpy", "parallel", "chunked"])
+    ap.add_argument("--seed", type=int, default=config.WORLD_SEED if config.WORLD_SEED is not None else 1337)
+    ap.add_argument("--size", type=int, default=config.MAP_WIDTH, help="map side in tiles (bounded backends)")
+    ap.add_argument("--render-mode", default=config.RENDER_MODE, choices=["tiles", "chunks", "surfarray", "lod"])
+    ap.add_argument("--no-minimap", action="store_true")
+    ap.add_argument("--out", help="write the JSON here instead of stdout")
+    args = ap.parse_args(argv)
+
+    result = run(args.frames, args.backend, args.seed, args.size, args.render_mode, not args.no_minimap)
+    text = json.dumps(result, indent=2)
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+# -------------------- bench_memory.py --------------------
+# Bytes per tile: object-per-tile World vs the struct-of-arrays NumpyWorld.
+#
+#   python bench_memory.py
+#   python bench_memory.py --sizes 150 1024 4096 --measure-max 1024
+import argparse, tracemalloc
+
+from tiles import Tile
+from world_np import NumpyWorld
+
+
+def traced(build):
+    """Run build() and return (result, bytes still allocated afterwards)."""
+    tracemalloc.start()
+    try:
+        result = build()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current
+
+
+def tile_objects(size):
+    # same objects World builds, minus terrain generation
+    return [[Tile(x, y, 0.0, 300.0) for x in range(size)] for y in range(size)]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Per-tile memory of the world stores.")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[150, 1024, 4096])
+    ap.add_argument("--measure-max", type=int, default=1024,
+                    help="largest size to build Tile objects for; bigger maps are extrapolated")
+    args = ap.parse_args()
+
+    print(f"{'map':>11}  {'Tile objects':>18}  {'NumpyWorld':>18}")
+    tile_bytes = None
+    for size in args.sizes:
+        tiles = size * size
+
+        if size <= args.measure_max or tile_bytes is None:
+            grid, used = traced(lambda: tile_objects(size))
+            del grid
+            tile_bytes = used / tiles
+            tile_note = ""
+        else:
+            tile_note = " est."
+
+        world, used = traced(lambda: NumpyWorld(size, size, generate=False))
+        store_bytes = used / tiles
+        del world
+
+        print(f"{size:>5}x{size:<5}  {tile_bytes:8.1f} B/tile{tile_note:<5}  {store_bytes:8.1f} B/tile"
+              f"   ({tile_bytes * tiles / 2**20:9.1f} MiB vs {store_bytes * tiles / 2**20:8.1f} MiB)")
+
+
+if __name__ == "__main__":
+    main()
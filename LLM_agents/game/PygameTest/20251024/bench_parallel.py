@@ -0,0 +1,57 @@
+# -------------------- bench_parallel.py --------------------
+# Tiles/sec of ParallelWorld.simulate_step for 1..N worker processes.
+#
+#   python bench_parallel.py --size 2048 --steps 20
+import argparse, os, time
+
+import numpy as np
+
+from world_np import NumpyWorld
+from world_parallel import ParallelWorld
+
+
+def random_state(world, seed):
+    """Fill a world that was built with generate=False with plausible fields."""
+    rng = np.random.default_rng(seed)
+    world.heat[:] = rng.uniform(280, 320, (world.h, world.w))
+    world.water[:] = rng.random((world.h, world.w))
+    world.earth[:] = 1.0 - world.water
+    world.nature[:] = rng.uniform(0.0, 5.0, (world.h, world.w))
+    world.update_visual()
+
+
+def tiles_per_sec(world, steps):
+    world.simulate_step()  # warm-up
+    start = time.perf_counter()
+    for _ in range(steps):
+        world.simulate_step()
+    return world.w * world.h * steps / (time.perf_counter() - start)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="ParallelWorld scaling benchmark.")
+    ap.add_argument("--size", type=int, default=2048)
+    ap.add_argument("--steps", type=int, default=20)
+    ap.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--chunk", type=int, default=256)
+    args = ap.parse_args()
+
+    print(f"map {args.size}x{args.size}, {args.steps} steps, chunk {args.chunk}")
+
+    world = NumpyWorld(args.size, args.size, generate=False)
+    random_state(world, 0)
+    single = tiles_per_sec(world, args.steps)
+    print(f"{'NumpyWorld':<12} {single / 1e6:8.2f} Mtiles/s  ({args.size * args.size / single * 1000:7.2f} ms/step)")
+
+    for workers in range(1, args.max_workers + 1):
+        world = ParallelWorld(args.size, args.size, workers=workers, chunk_size=args.chunk, generate=False)
+        try:
+            random_state(world, 0)
+            rate = tiles_per_sec(world, args.steps)
+        finally:
+            world.close()
+        print(f"{workers:>2} worker(s) {rate / 1e6:8.2f} Mtiles/s  ({args.size * args.size / rate * 1000:7.2f} ms/step)  x{rate / single:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# -------------------- bench_profiler.py --------------------
+# Cost of one Profiler start/stop pair (flat and nested), and of end_frame().
+#
+#   python bench_profiler.py --pairs 1000000
+import argparse
+from time import perf_counter_ns
+
+from profiler import Profiler
+
+
+def empty_loop(n):
+    start = perf_counter_ns()
+    for _ in range(n):
+        pass
+    return perf_counter_ns() - start
+
+
+def flat(profiler, n):
+    start_, stop = profiler.start, profiler.stop
+    start = perf_counter_ns()
+    for _ in range(n):
+        start_("section")
+        stop("section")
+    return perf_counter_ns() - start
+
+
+def nested(profiler, n):
+    start_, stop = profiler.start, profiler.stop
+    start = perf_counter_ns()
+    for _ in range(n // 2):
+        start_("outer")
+        start_("inner")
+        stop("inner")
+        stop("outer")
+    return perf_counter_ns() - start
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Profiler overhead per start/stop pair.")
+    ap.add_argument("--pairs", type=int, default=1_000_000)
+    ap.add_argument("--sections", type=int, default=20, help="sections closed by each end_frame()")
+    args = ap.parse_args()
+
+    n = args.pairs
+    for label, run, loops in (("flat", flat, n), ("nested", nested, n // 2)):
+        profiler = Profiler(report_ms=1e9)
+        ns = run(profiler, n) - empty_loop(loops)  # minus the bare loop
+        print(f"{label:<8} {ns / n:7.1f} ns per start/stop pair")
+
+    profiler = Profiler(report_ms=1e9)
+    for i in range(args.sections):
+        profiler.start(f"s{i}")
+        profiler.stop(f"s{i}")
+    frames = 10_000
+    start = perf_counter_ns()
+    for _ in range(frames):
+        profiler.end_frame()
+    print(f"end_frame {(perf_counter_ns() - start) / frames / 1000:7.2f} us with {args.sections} sections")
+
+
+if __name__ == "__main__":
+    main()
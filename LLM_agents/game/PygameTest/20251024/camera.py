@@ -1,25 +1,78 @@
 # -------------------- camera.py --------------------
 import pygame, math
-from config import WINDOW_WIDTH, WINDOW_HEIGHT, MAX_ZOOM_OUT, MIN_ZOOM_IN
+import numpy as np
+from config import WINDOW_WIDTH, WINDOW_HEIGHT, TILE_SIZE, MAX_ZOOM_OUT, MIN_ZOOM_IN
 
 
 class Camera:
     def __init__(self):
         self.zoom = 1.0
         self.target_zoom = 1.0
+        self.max_zoom_out = MAX_ZOOM_OUT  # lowest zoom allowed, see fit_map()
         self.pos = pygame.Vector2(0, 0)
+        self._key = None  # (pos.x, pos.y, zoom) the cached transform belongs to
+        self._offset = (0, 0)
+        self._edges = {}  # (axis, t0, t1) -> screen edges of tiles t0..t1
 
 
+    # -----------------------------
+    # == Projection (cached per camera state)
+    # -----------------------------
+    def _transform(self):
+        key = (self.pos.x, self.pos.y, self.zoom)
+        if key != self._key:
+            self._key = key
+            self._offset = (round(self.pos.x * self.zoom), round(self.pos.y * self.zoom))
+            self._edges = {}
+        return self._offset
+
+    def offset(self):
+        """Screen position of world (0, 0), negated. Whole pixels, so frames can be scrolled exactly."""
+        return self._transform()
+
+    def world_to_screen(self, wx, wy):
+        ox, oy = self._transform()
+        return math.floor(wx * self.zoom) - ox, math.floor(wy * self.zoom) - oy
+
     def apply(self, rect):
-        return pygame.Rect(
-        int((rect.x - self.pos.x) * self.zoom),
-        int((rect.y - self.pos.y) * self.zoom),
-        math.ceil(rect.width * self.zoom),
-        math.ceil(rect.height * self.zoom)
-)
+        x, y = self.world_to_screen(rect.x, rect.y)
+        return pygame.Rect(x, y, math.ceil(rect.width * self.zoom), math.ceil(rect.height * self.zoom))
+
+    def tile_edges(self, axis, t0, t1):
+        """Screen x (axis 0) or y (axis 1) of tile edges t0..t1 inclusive; tile t spans [e[t-t0], e[t-t0+1])."""
+        off = self._transform()[axis]
+        key = (axis, t0, t1)
+        edges = self._edges.get(key)
+        if edges is None:
+            if len(self._edges) > 64:
+                self._edges = {}
+            edges = np.floor(np.arange(t0, t1 + 1) * TILE_SIZE * self.zoom).astype(np.int64) - off
+            self._edges[key] = edges
+        return edges
+
+    def project_tiles(self, x0, y0, x1, y1):
+        """Column and row edges for the tile window [y0:y1, x0:x1]: O(rows + cols), not O(tiles)."""
+        return self.tile_edges(0, x0, x1), self.tile_edges(1, y0, y1)
+
+    def project_rects(self, rects):
+        """(N, 4) world rects (x, y, w, h) -> (N, 4) int screen rects, same rounding as apply()."""
+        rects = np.asarray(rects, dtype=np.float64).reshape(-1, 4)
+        ox, oy = self._transform()
+        out = np.empty(rects.shape, dtype=np.int64)
+        out[:, 0] = np.floor(rects[:, 0] * self.zoom) - ox
+        out[:, 1] = np.floor(rects[:, 1] * self.zoom) - oy
+        out[:, 2:] = np.ceil(rects[:, 2:] * self.zoom)
+        return out
+
+    def fit_map(self, w, h):
+        """Allow zooming out until a w x h tile map fits the window (never less far than MAX_ZOOM_OUT)."""
+        fit = min(WINDOW_WIDTH / (w * TILE_SIZE), WINDOW_HEIGHT / (h * TILE_SIZE))
+        self.max_zoom_out = min(MAX_ZOOM_OUT, fit)
 
     def update(self, target_rect):
-        self.target_zoom = max(MAX_ZOOM_OUT, min(MIN_ZOOM_IN, self.target_zoom))
+        self.target_zoom = max(self.max_zoom_out, min(MIN_ZOOM_IN, self.target_zoom))
         self.pos.x = target_rect.centerx - WINDOW_WIDTH / (2 * self.zoom)
         self.pos.y = target_rect.centery - WINDOW_HEIGHT / (2 * self.zoom)
         self.zoom += (self.target_zoom - self.zoom) * 0.1
+        if abs(self.target_zoom - self.zoom) < 1e-3 * self.target_zoom:
+            self.zoom = self.target_zoom  # settle, so a still camera really is still
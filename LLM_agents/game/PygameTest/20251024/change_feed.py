@@ -0,0 +1,73 @@
+# -------------------- change_feed.py --------------------
+import threading
+from collections import deque
+import numpy as np
+from config import CHANGE_FEED_TILES
+
+# ==========================================================
+# == CHANGE FEED
+# ==========================================================
+# Every world appends the tiles whose colour index changed to its feed
+# (simulation steps, player edits, chunks appearing or going away). A
+# consumer keeps a cursor and asks for everything after it, so it can
+# update only those tiles instead of re-reading the whole map. The log
+# holds at most `capacity` tiles; a consumer that fell further behind, or
+# a reset() (everything changed), gets None and must re-read in full.
+
+NO_TILES = np.zeros(0, dtype=np.int64)
+
+
+class ChangeFeed:
+    def __init__(self, capacity=CHANGE_FEED_TILES):
+        self.capacity = capacity
+        self.seq = 0  # id of the newest batch
+        self._batches = deque()  # (seq, xs, ys)
+        self._size = 0
+        self._floor = 0  # cursors older than this have missed changes
+        self._lock = threading.Lock()  # written by the simulation thread, read by the renderer
+
+    def record(self, xs, ys):
+        """Log tiles (xs[i], ys[i]) in world coordinates as changed."""
+        xs = np.asarray(xs, dtype=np.int64).ravel()
+        ys = np.asarray(ys, dtype=np.int64).ravel()
+        if not len(xs):
+            return
+        with self._lock:
+            self.seq += 1
+            self._batches.append((self.seq, xs, ys))
+            self._size += len(xs)
+            while self._size > self.capacity:
+                seq, old, _ = self._batches.popleft()
+                self._size -= len(old)
+                self._floor = seq
+
+    def record_rect(self, x0, y0, x1, y1):
+        ys, xs = np.mgrid[y0:y1, x0:x1]
+        self.record(xs, ys)
+
+    def reset(self):
+        """Everything may have changed: every consumer re-reads in full."""
+        with self._lock:
+            self.seq += 1
+            self._batches.clear()
+            self._size = 0
+            self._floor = self.seq
+
+    def since(self, cursor, upto=None):
+        """
+        Changes after cursor (up to batch upto, default all) as (new_cursor, xs, ys).
+        xs and ys are None if they are no longer known.
+        """
+        with self._lock:
+            upto = self.seq if upto is None else upto
+            if cursor < self._floor:
+                return upto, None, None
+            parts = [(xs, ys) for seq, xs, ys in self._batches if cursor < seq <= upto]
+        if not parts:
+            return upto, NO_TILES, NO_TILES
+        return upto, np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+
+def read_changes(world, cursor):
+    """Shared by every world type as changes_since(): see ChangeFeed.since."""
+    return world.changes.since(cursor)
@@ -0,0 +1,279 @@
+# -------------------- chunk_world.py --------------------
+import atexit, shutil, tempfile
+from collections import OrderedDict
+from pathlib import Path
+import numpy as np
+import pygame
+from config import TILE_SIZE, TREE_THRESHOLD, CHUNK_TILES, ACTIVE_CHUNK_RADIUS, LOAD_CHUNK_RADIUS, CHUNK_MEMORY_CAP_MB
+from terrain import open_fields, resolve_seed
+from tiles import TileView, VOID_INDEX, edit_tile_nature
+from change_feed import ChangeFeed, read_changes
+from world_np import FIELDS, PALETTE_PACKED, apply_terrain, seed_vegetation, index_grid, step_region
+
+# ==========================================================
+# == CHUNK WORLD
+# ==========================================================
+# Endless world made of CHUNK_TILES x CHUNK_TILES chunks.
+#   - chunks are generated (deterministically from seed + chunk coords) on first access
+#   - only chunks within ACTIVE_CHUNK_RADIUS of the focus are simulated
+#   - when loaded chunks exceed CHUNK_MEMORY_CAP_MB the least recently used ones
+#     outside LOAD_CHUNK_RADIUS are dropped; chunks that changed since generation
+#     are first spilled to a compressed .npz store and reloaded from there later
+#     (a fresh directory per ChunkWorld, so concurrent games never share one)
+# Renderer and minimap read through color_block(), which never loads chunks.
+
+CHUNK_STORE_DIR = Path(__file__).resolve().parent / "state" / "chunks"
+
+
+class Chunk:
+    __slots__ = ("cx", "cy", "x0", "y0", "heat", "water", "earth", "nature", "color_index", "modified", "changes")
+
+    def __init__(self, cx, cy, size, fields, changes=None):
+        self.cx, self.cy = cx, cy
+        self.x0, self.y0 = cx * size, cy * size
+        for name in FIELDS:
+            setattr(self, name, fields[name])
+        self.color_index = index_grid(self.water, self.nature, self.heat)
+        self.modified = False  # True once it differs from what generation would give
+        self.changes = changes  # the ChunkWorld's ChangeFeed (world coordinates)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in FIELDS) + self.color_index.nbytes
+
+    # TileView hooks (a chunk is the "world" of its tiles, in local coordinates)
+    def write(self, name, x, y, value):
+        getattr(self, name)[y, x] = value
+        self.modified = True
+
+    def is_obstacle(self, x, y):
+        return bool(self.nature[y, x] >= TREE_THRESHOLD)
+
+    def mark_active(self, x, y):
+        self.modified = True
+
+
+class ChunkTileView(TileView):
+    """TileView on a Chunk; rect is in world coordinates."""
+
+    __slots__ = ()
+
+    @property
+    def rect(self):
+        return pygame.Rect((self.world.x0 + self.x) * TILE_SIZE, (self.world.y0 + self.y) * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+
+    def _edited(self):
+        chunk = self.world
+        chunk.mark_active(self.x, self.y)
+        if chunk.changes is not None:
+            chunk.changes.record((chunk.x0 + self.x,), (chunk.y0 + self.y,))
+
+
+class ChunkWorld:
+    bounds = None  # endless
+    step_limit = None  # simulate_step budget; ignored, every active chunk steps each call
+
+    def __init__(self, seed=None, chunk_size=CHUNK_TILES, active_radius=ACTIVE_CHUNK_RADIUS,
+                 load_radius=LOAD_CHUNK_RADIUS, memory_cap_mb=CHUNK_MEMORY_CAP_MB, store_dir=None):
+        self.seed, _ = resolve_seed(seed)
+        self.chunk_size = chunk_size
+        self.active_radius = active_radius
+        self.load_radius = max(load_radius, active_radius + 1)  # active chunks need a loaded halo
+        self.memory_cap = int(memory_cap_mb * 2**20)
+        self.chunks = OrderedDict()  # (cx, cy) -> Chunk, least recently used first
+        self.focus = (0, 0)
+        self.memory_bytes = 0
+        self.sweeps = 0
+        self.active_count = 0
+        self.stats = {"generated": 0, "loaded": 0, "saved": 0, "evicted": 0}
+        self.changes = ChangeFeed()  # tiles whose colour changed (incl. chunks appearing / dropped)
+
+        # spill store for this session only: other games with the same seed run alongside in batch mode
+        if store_dir:
+            self.store_dir = Path(store_dir)
+            shutil.rmtree(self.store_dir, ignore_errors=True)
+        else:
+            CHUNK_STORE_DIR.mkdir(parents=True, exist_ok=True)
+            self.store_dir = Path(tempfile.mkdtemp(prefix=f"seed{self.seed}-", dir=CHUNK_STORE_DIR))
+        atexit.register(self.close)
+
+    # -----------------------------
+    # == Chunk access
+    # -----------------------------
+    def chunk_of(self, x, y):
+        return x // self.chunk_size, y // self.chunk_size
+
+    def peek_chunk(self, cx, cy):
+        """Loaded chunk or None. Never generates or reads from disk."""
+        chunk = self.chunks.get((cx, cy))
+        if chunk is not None:
+            self.chunks.move_to_end((cx, cy))
+        return chunk
+
+    def get_chunk(self, cx, cy):
+        """Chunk (cx, cy), generating or reloading it if needed."""
+        chunk = self.peek_chunk(cx, cy)
+        if chunk is None:
+            chunk = self._load(cx, cy) or self._generate(cx, cy)
+            self.chunks[(cx, cy)] = chunk
+            self.memory_bytes += chunk.nbytes
+            self._record_chunk(chunk)
+            self._evict()
+        return chunk
+
+    def focus_on(self, x, y):
+        """Centre loading and simulation on tile (x, y); loads everything within load_radius."""
+        self.focus = self.chunk_of(x, y)
+        fx, fy = self.focus
+        r = self.load_radius
+        for cy in range(fy - r, fy + r + 1):
+            for cx in range(fx - r, fx + r + 1):
+                self.get_chunk(cx, cy)
+
+    def focus_bounds(self):
+        """(x0, y0, x1, y1) tile rect covered by the loaded area around the focus."""
+        fx, fy = self.focus
+        r, c = self.load_radius, self.chunk_size
+        return ((fx - r) * c, (fy - r) * c, (fx + r + 1) * c, (fy + r + 1) * c)
+
+    def _generate(self, cx, cy):
+        c = self.chunk_size
+        height, temp = open_fields(cx * c, cy * c, c, c, self.seed)
+        fields = {name: np.zeros((c, c), dtype=np.float32) for name in FIELDS}
+        apply_terrain(fields, height, temp)
+        seed_vegetation(fields, np.random.default_rng([self.seed, cx + 2**31, cy + 2**31]))
+        self.stats["generated"] += 1
+        return Chunk(cx, cy, c, fields, self.changes)
+
+    def _path(self, cx, cy):
+        return self.store_dir / f"chunk_{cx}_{cy}.npz"
+
+    def _load(self, cx, cy):
+        path = self._path(cx, cy)
+        if not path.exists():
+            return None
+        with np.load(path) as data:
+            fields = {name: data[name] for name in FIELDS}
+        chunk = Chunk(cx, cy, self.chunk_size, fields, self.changes)
+        chunk.modified = True  # still differs from generation
+        self.stats["loaded"] += 1
+        return chunk
+
+    def _save(self, chunk):
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(self._path(chunk.cx, chunk.cy), **{name: getattr(chunk, name) for name in FIELDS})
+        self.stats["saved"] += 1
+
+    def _evict(self):
+        if self.memory_bytes <= self.memory_cap:
+            return
+        fx, fy = self.focus
+        r = self.load_radius
+        for key in list(self.chunks):
+            if self.memory_bytes <= self.memory_cap:
+                break
+            if abs(key[0] - fx) <= r and abs(key[1] - fy) <= r:
+                continue  # around the focus: keep
+            chunk = self.chunks.pop(key)
+            if chunk.modified:
+                self._save(chunk)
+            self.memory_bytes -= chunk.nbytes
+            self.stats["evicted"] += 1
+            self._record_chunk(chunk)
+
+    def _record_chunk(self, chunk):
+        """A chunk came or went: all its tiles changed colour (to or from VOID_INDEX)."""
+        c = self.chunk_size
+        self.changes.record_rect(chunk.x0, chunk.y0, chunk.x0 + c, chunk.y0 + c)
+
+    # -----------------------------
+    # == Tile access (same API as World / NumpyWorld)
+    # -----------------------------
+    def tile_at(self, x, y):
+        chunk = self.get_chunk(*self.chunk_of(x, y))
+        return ChunkTileView(chunk, x - chunk.x0, y - chunk.y0)
+
+    def is_obstacle(self, x, y):
+        chunk = self.peek_chunk(*self.chunk_of(x, y))
+        return chunk is not None and chunk.is_obstacle(x - chunk.x0, y - chunk.y0)
+
+    def mark_active(self, x, y):
+        chunk = self.peek_chunk(*self.chunk_of(x, y))
+        if chunk is not None:
+            chunk.modified = True
+
+    edit_nature = edit_tile_nature
+    changes_since = read_changes
+
+    def _gather(self, x0, y0, x1, y1, read, fill, dtype, load):
+        """Stitch read(chunk) grids into one [y0:y1, x0:x1] array; fill where no chunk is loaded."""
+        c = self.chunk_size
+        out = np.full((y1 - y0, x1 - x0), fill, dtype=dtype)
+        for cy in range(y0 // c, (y1 - 1) // c + 1):
+            for cx in range(x0 // c, (x1 - 1) // c + 1):
+                chunk = self.get_chunk(cx, cy) if load else self.peek_chunk(cx, cy)
+                if chunk is None:
+                    continue
+                ax0, ay0 = max(x0, chunk.x0), max(y0, chunk.y0)
+                ax1, ay1 = min(x1, chunk.x0 + c), min(y1, chunk.y0 + c)
+                out[ay0 - y0:ay1 - y0, ax0 - x0:ax1 - x0] = \
+                    read(chunk)[ay0 - chunk.y0:ay1 - chunk.y0, ax0 - chunk.x0:ax1 - chunk.x0]
+        return out
+
+    def index_block(self, x0, y0, x1, y1, load=False):
+        """PALETTE indices of tiles [y0:y1, x0:x1]. Chunks that are not loaded give VOID_INDEX unless load=True."""
+        return self._gather(x0, y0, x1, y1, lambda chunk: chunk.color_index, VOID_INDEX, np.uint8, load)
+
+    def obstacle_block(self, x0, y0, x1, y1, load=False):
+        """Boolean grid of blocking tiles in [y0:y1, x0:x1]; False where no chunk is loaded."""
+        return self._gather(x0, y0, x1, y1, lambda chunk: chunk.nature >= TREE_THRESHOLD, False, bool, load)
+
+    def color_block(self, x0, y0, x1, y1, load=False):
+        """Packed colours of tiles [y0:y1, x0:x1]; VOID_COLOR where no chunk is loaded."""
+        return PALETTE_PACKED[self.index_block(x0, y0, x1, y1, load)]
+
+    @property
+    def nbytes(self):
+        return self.memory_bytes
+
+    # -----------------------------
+    # == Simulation
+    # -----------------------------
+    def simulate_step(self, budget=None):
+        """One step of every chunk within active_radius of the focus (budget is ignored)."""
+        c, r = self.chunk_size, self.active_radius
+        fx, fy = self.focus
+        span = 2 * r + 3  # active chunks plus one ring of halo chunks
+        size = span * c
+
+        src = {name: np.empty((size, size), dtype=np.float32) for name in FIELDS}
+        for j in range(span):
+            for i in range(span):
+                chunk = self.get_chunk(fx - r - 1 + i, fy - r - 1 + j)
+                for name in FIELDS:
+                    src[name][j * c:(j + 1) * c, i * c:(i + 1) * c] = getattr(chunk, name)
+
+        dst = {name: np.empty_like(src[name]) for name in FIELDS}
+        dst["color_index"] = np.empty((size, size), dtype=np.uint8)
+        count = np.full((size, size), 8, dtype=np.uint8)  # no map border anywhere
+        step_region(src, dst, count, c, size - c, c, size - c)
+
+        changed_xs, changed_ys = [], []
+        for j in range(1, span - 1):
+            for i in range(1, span - 1):
+                chunk = self.get_chunk(fx - r - 1 + i, fy - r - 1 + j)
+                block = (slice(j * c, (j + 1) * c), slice(i * c, (i + 1) * c))
+                ys, xs = np.nonzero(chunk.color_index != dst["color_index"][block])
+                changed_xs.append(xs + chunk.x0)
+                changed_ys.append(ys + chunk.y0)
+                for name in FIELDS + ("color_index",):
+                    getattr(chunk, name)[:] = dst[name][block]
+                chunk.modified = True
+        self.changes.record(np.concatenate(changed_xs), np.concatenate(changed_ys))
+
+        self.sweeps += 1
+        self.active_count = (span - 2) ** 2 * c * c
+
+    def close(self):
+        """Drop the spill store."""
+        shutil.rmtree(self.store_dir, ignore_errors=True)
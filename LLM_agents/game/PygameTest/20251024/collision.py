@@ -0,0 +1,56 @@
+# -------------------- collision.py --------------------
+from config import TILE_SIZE
+
+# ==========================================================
+# == COLLISION
+# ==========================================================
+# Axis-separated swept AABB. A move along one axis only looks at the tiles
+# inside the strip the rect's leading edge sweeps
+# through, so its cost is the number of tiles touched, not the number of
+# obstacles on the map. Tiles the rect already overlaps never block it,
+# so something growing underneath the player can't trap it.
+
+
+def sweep_tiles(rect, delta, axis, is_blocked):
+    """
+    How far rect can move (delta px, axis 0 = x, 1 = y) before hitting a tile
+    for which is_blocked(tx, ty) is true. Returns the allowed delta.
+    """
+    if delta == 0:
+        return 0
+    if axis == 0:
+        lo, hi, side_lo, side_hi = rect.left, rect.right, rect.top, rect.bottom
+    else:
+        lo, hi, side_lo, side_hi = rect.top, rect.bottom, rect.left, rect.right
+    across = range(side_lo // TILE_SIZE, (side_hi - 1) // TILE_SIZE + 1)
+
+    def blocked(t):
+        if axis == 0:
+            return any(is_blocked(t, c) for c in across)
+        return any(is_blocked(c, t) for c in across)
+
+    if delta > 0:
+        for t in range((hi - 1) // TILE_SIZE + 1, (hi + delta - 1) // TILE_SIZE + 1):
+            if blocked(t):
+                return t * TILE_SIZE - hi
+    else:
+        for t in range(lo // TILE_SIZE - 1, (lo + delta) // TILE_SIZE - 1, -1):
+            if blocked(t):
+                return (t + 1) * TILE_SIZE - lo
+    return delta
+
+
+def move_and_collide(rect, dx, dy, is_blocked):
+    """
+    Move rect in place by (dx, dy), x first, then y, stopping at blocked tiles.
+    Returns (hit_x, hit_y).
+    """
+    hits = []
+    for axis, delta in ((0, dx), (1, dy)):
+        allowed = sweep_tiles(rect, delta, axis, is_blocked)
+        if axis == 0:
+            rect.x += allowed
+        else:
+            rect.y += allowed
+        hits.append(allowed != delta)
+    return tuple(hits)
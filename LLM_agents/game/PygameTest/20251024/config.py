@@ -1,9 +1,43 @@
 # -------------------- config.py --------------------
+import os
 FPS = 60
+SIM_HZ = 60  # simulation ticks per second, independent of FPS
+MAX_CATCHUP_TICKS = 5  # most ticks run in one frame; the rest are dropped
+SIM_THREAD = False  # step the world on a background thread; the render loop only reads published snapshots
+FRAME_BUDGET_MS = 1000 / FPS  # frames whose 'frame' section takes longer count as overruns
+PROFILE_WINDOW = 300  # frames the profiler's percentiles are taken over
+PROFILE_REPORT_MS = 3000  # time between profiler reports
+PROFILE_TRACE_FILE = os.environ.get("GAME_TRACE_FILE", "logs/profile_trace.json")  # Chrome trace, written on exit and on F9
+PROFILE_TRACE_EVENTS = 200_000 if "GAME_TRACE_FILE" in os.environ else 0  # start/stop events kept for it, 0 = no tracing
+METRICS_FILE = os.environ.get("GAME_METRICS_FILE")  # binary per-frame metrics for the runner (frame_metrics.py), None = off
+METRICS_FLUSH_FRAMES = 60  # frames buffered between writes to it
 WINDOW_WIDTH, WINDOW_HEIGHT = 1200, 720
 TILE_SIZE = 16
 MAP_WIDTH, MAP_HEIGHT = 150, 150
 UPDATE_STEP_LIMIT = 6000
+WORLD_SEED = 1337  # same seed -> same island; None = new random island every start
+USE_WORLD_CACHE = True  # keep generated terrain fields in state/world_cache/*.npz
+SIM_BACKEND = "numpy"  # "python" = per-tile World, "numpy" = whole-grid NumpyWorld, "parallel" = multi-core ParallelWorld, "chunked" = endless ChunkWorld
+DOUBLE_BUFFERED = True  # World reads last sweep's state -> results independent of UPDATE_STEP_LIMIT
+NUMPY_UPDATE_STEP_LIMIT = None  # tiles per frame for NumpyWorld, None = one full sweep per frame
+ACTIVE_SCHEDULING = True  # only simulate tiles that changed last sweep, plus their neighbours
+ACTIVE_EPSILON = 1e-3  # water/nature change that keeps a tile awake
+ACTIVE_HEAT_EPSILON = 0.05  # heat change (K) that keeps a tile awake; above open-water cooling per step
+SIM_CHUNK_SIZE = 64  # tiles per side of a chunk stepped by one ParallelWorld worker
+SIM_WORKERS = None  # ParallelWorld worker processes, None = os.cpu_count()
+CHUNK_TILES = 32  # tiles per side of a ChunkWorld chunk
+ACTIVE_CHUNK_RADIUS = 2  # chunks around the player that are simulated
+LOAD_CHUNK_RADIUS = 6  # chunks around the player that are kept loaded
+CHUNK_MEMORY_CAP_MB = 64  # above this, least recently used chunks are evicted
+RENDER_MODE = "lod"  # "tiles" = one fill per tile, "chunks" = cached surface per chunk, "surfarray" = colour-index image scaled once, "lod" = mip pyramid level picked by zoom
+LOD_TEXEL_PX = 2  # "lod": once a tile is drawn narrower than this many px, use the finest level whose texels are at least this wide
+RENDER_CHUNK_TILES = 32  # tiles per side of a cached render chunk
+DIRTY_RECTS = True  # redraw/push only changed screen areas instead of fill + flip every frame
+DIRTY_CELL_TILES = 8  # changed tiles are repainted in cells of this many tiles per side
+MAX_DIRTY_RECTS = 64  # more changed areas than this -> full redraw
+BACKGROUND_COLOR = (10, 10, 30)
+CHANGE_FEED_TILES = 1 << 16  # changed tiles a world remembers for incremental consumers (minimap)
+SHOW_MINIMAP = False  # draw the minimap overlay with the player marker
 
 
 HEAT_DIFFUSE_RATE = 0.10
@@ -18,6 +52,6 @@ VILLAGE_COUNT = 8
 NPCS_PER_VILLAGE = 8
 VILLAGE_RADIUS_TILES = 12
 
-MAX_ZOOM_OUT = 0.2
+MAX_ZOOM_OUT = 0.05  # tiles under 1 px: the default map zooms out into the coarse LOD levels (fit_map may go lower)
 MIN_ZOOM_IN = 3.5
 UPDATE_STEP_LIMIT = 6000  # number of tiles to process per frame (performance cap)
\ No newline at end of file
@@ -0,0 +1,52 @@
+# -------------------- frame_metrics.py --------------------
+import os, struct
+from config import METRICS_FLUSH_FRAMES
+
+# ==========================================================
+# == FRAME METRICS CHANNEL
+# ==========================================================
+# Append-only binary file the runner reads after the game exits
+# (GAME_METRICS_FILE, named after the run's TRACE_ID). Layout, little-endian:
+#   header  "GFM1", u16 version, u16 record size
+#   record  u32 frame, f32 frame_ms (tick to tick, what the player sees),
+#           f32 busy_ms (the profiler's 'frame' section), u32 active_tiles,
+#           u32 tiles_simulated (by the sweeps that finished this frame), f32 fps
+# Records are packed into a buffer and written every METRICS_FLUSH_FRAMES
+# frames, so a killed game loses at most that many. Written by main.py and
+# bench_game.py; the runner-side reader (agent_runtime/frame_metrics.py)
+# must match this layout.
+
+MAGIC = b"GFM1"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")
+RECORD = struct.Struct("<IffIIf")
+
+
+class FrameMetrics:
+    def __init__(self, path, flush_every=METRICS_FLUSH_FRAMES):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.file = open(path, "ab")
+        if self.file.tell() == 0:
+            self.file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+        self.flush_every = flush_every
+        self.frame = 0
+        self._buffer = bytearray(RECORD.size * flush_every)
+        self._pending = 0  # records in _buffer
+
+    def record(self, frame_ms, busy_ms, active_tiles, tiles_simulated, fps):
+        RECORD.pack_into(self._buffer, self._pending * RECORD.size,
+                         self.frame, frame_ms, busy_ms, active_tiles, tiles_simulated, fps)
+        self.frame += 1
+        self._pending += 1
+        if self._pending == self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if self._pending and not self.file.closed:
+            self.file.write(memoryview(self._buffer)[:self._pending * RECORD.size])
+            self.file.flush()
+        self._pending = 0
+
+    def close(self):
+        self.flush()
+        self.file.close()
@@ -86,19 +86,13 @@ class InputHandler:
             return
 
         px, py = int(player_rect.centerx // TILE_SIZE), int(player_rect.centery // TILE_SIZE)
-        if not (0 <= px < world.w and 0 <= py < world.h):
-            return
-
-        tile = world.tiles[py][px]
         a_pressed = self.joystick.get_button(0)
         b_pressed = self.joystick.get_button(1)
 
         if a_pressed:
-            tile.nature = min(5.0, tile.nature + 0.25)
-            tile.update_visual()
+            world.edit_nature(px, py, +0.25)
         elif b_pressed:
-            tile.nature = max(0.0, tile.nature - 0.25)
-            tile.update_visual()
+            world.edit_nature(px, py, -0.25)
 
     def is_stick_up(self):
         if not self.joystick:
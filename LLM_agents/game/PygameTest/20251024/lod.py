@@ -0,0 +1,134 @@
+# -------------------- lod.py --------------------
+import math
+import numpy as np
+import pygame
+from config import TILE_SIZE, LOD_TEXEL_PX
+from tiles import PALETTE, VOID_INDEX
+
+# ==========================================================
+# == LOD PYRAMID
+# ==========================================================
+# Mip-style images of the world colours: level 0 has one pixel per tile,
+# level k one pixel per 2^k x 2^k tiles (the mean of its four level k-1
+# children). sync() reads the world's change feed and only recomputes the
+# texels above tiles that changed, so a frame costs the dirty texels plus
+# small reads around them, whatever the zoom and the map size.
+
+PALETTE_RGB = np.array(PALETTE, dtype=np.uint8)
+READ_CELL = 64  # changed tiles are read back in blocks of this many tiles square
+
+
+def read_indices(world, xs, ys, cell=READ_CELL):
+    """world's colour indices at tiles (xs, ys), one index_block per cell x cell block touched."""
+    out = np.empty(len(xs), dtype=np.uint8)
+    cells, inverse = np.unique(np.stack([ys // cell, xs // cell], axis=1), axis=0, return_inverse=True)
+    order = np.argsort(inverse.ravel(), kind="stable")
+    ends = np.cumsum(np.bincount(inverse.ravel(), minlength=len(cells)))
+    start = 0
+    for (cy, cx), end in zip(cells.tolist(), ends.tolist()):
+        sel = order[start:end]
+        bx0, by0 = cx * cell, cy * cell
+        block = np.asarray(world.index_block(bx0, by0, bx0 + cell, by0 + cell))
+        out[sel] = block[ys[sel] - by0, xs[sel] - bx0]
+        start = end
+    return out
+
+
+class LodPyramid:
+    def __init__(self, min_size=16):
+        self.min_size = min_size  # stop adding levels once a side gets this small
+        self.region = None  # (x0, y0, x1, y1) in tiles
+        self.cursor = 0  # position in the world's change feed
+        self.levels = []  # (h, w, 3) uint8 RGB per level
+        self.surfaces = []  # matching pygame surfaces
+        self.rebuilt_texels = 0  # texels recomputed by the last sync
+
+    def sync(self, world, region):
+        """Bring the pyramid up to date with world's tiles in region = (x0, y0, x1, y1)."""
+        if region != self.region:
+            self._build(world, region)
+            return
+        self.cursor, xs, ys = world.changes_since(self.cursor)
+        if xs is None:  # fell behind the feed
+            self._build(world, region)
+            return
+        x0, y0, x1, y1 = region
+        inside = (xs >= x0) & (xs < x1) & (ys >= y0) & (ys < y1)
+        self.rebuilt_texels = 0
+        if not inside.any():
+            return
+
+        w = x1 - x0
+        ys, xs = np.divmod(np.unique((ys[inside] - y0) * w + (xs[inside] - x0)), w)
+        self.levels[0][ys, xs] = PALETTE_RGB[read_indices(world, xs + x0, ys + y0)]
+        self.rebuilt_texels = len(ys)
+        self._blit_dirty(0, ys, xs)
+
+        for k in range(1, len(self.levels)):
+            w = self.levels[k].shape[1]
+            ys, xs = np.divmod(np.unique((ys >> 1) * w + (xs >> 1)), w)  # parents of the changed texels
+            self.levels[k][ys, xs] = self._downsample_at(self.levels[k - 1], ys, xs)
+            self.rebuilt_texels += len(ys)
+            self._blit_dirty(k, ys, xs)
+
+    def _build(self, world, region):
+        self.cursor, _, _ = world.changes_since(self.cursor)  # everything up to now is read below
+        self.region = region
+        indices = np.asarray(world.index_block(*region))
+        self.levels = [PALETTE_RGB[indices]]
+        while min(self.levels[-1].shape[:2]) > self.min_size:
+            child = self.levels[-1]
+            h, w = (child.shape[0] + 1) // 2, (child.shape[1] + 1) // 2
+            ys, xs = np.mgrid[0:h, 0:w]
+            self.levels.append(self._downsample_at(child, ys.ravel(), xs.ravel()).reshape(h, w, 3))
+        self.surfaces = [pygame.surfarray.make_surface(level.swapaxes(0, 1)) for level in self.levels]
+        if (indices == VOID_INDEX).any():
+            for surface in self.surfaces:
+                surface.set_colorkey(PALETTE[VOID_INDEX])
+        self.rebuilt_texels = sum(level.shape[0] * level.shape[1] for level in self.levels)
+
+    @staticmethod
+    def _downsample_at(child, ys, xs):
+        """Mean of the 2x2 children of texels (ys, xs); odd edges reuse the last row/column."""
+        h, w = child.shape[:2]
+        y0, x0 = ys * 2, xs * 2
+        y1, x1 = np.minimum(y0 + 1, h - 1), np.minimum(x0 + 1, w - 1)
+        total = (child[y0, x0].astype(np.uint16) + child[y0, x1] + child[y1, x0] + child[y1, x1])
+        return (total // 4).astype(np.uint8)
+
+    def _blit_dirty(self, k, ys, xs):
+        """Copy the bounding box of changed texels (ys, xs) from levels[k] into its surface."""
+        y0, y1, x0, x1 = ys.min(), ys.max() + 1, xs.min(), xs.max() + 1
+        pixels = pygame.surfarray.pixels3d(self.surfaces[k])
+        pixels[x0:x1, y0:y1] = self.levels[k][y0:y1, x0:x1].swapaxes(0, 1)
+        del pixels  # unlock the surface
+
+    # -----------------------------
+    # == Drawing
+    # -----------------------------
+    def level_for(self, zoom):
+        """
+        Level for a camera zoom, from the on-screen tile size: level 0 while a
+        tile is drawn at least LOD_TEXEL_PX wide, else the finest level whose
+        texels (2^k tiles across) reach that width again.
+        """
+        tile_px = TILE_SIZE * zoom
+        if tile_px >= LOD_TEXEL_PX:
+            return 0
+        return min(len(self.levels) - 1, int(math.ceil(math.log2(LOD_TEXEL_PX / tile_px))))
+
+    def draw(self, surface, cam, x0, y0, x1, y1):
+        """Draw tiles [y0:y1, x0:x1] (inside self.region) as seen by cam. Returns the level used."""
+        k = self.level_for(cam.zoom)
+        s = 1 << k
+        rx0, ry0, rx1, ry1 = self.region
+        tx0, ty0 = (x0 - rx0) // s, (y0 - ry0) // s
+        tx1, ty1 = -(-(x1 - rx0) // s), -(-(y1 - ry0) // s)
+        tx1, ty1 = min(tx1, self.surfaces[k].get_width()), min(ty1, self.surfaces[k].get_height())
+
+        # screen edges of the texel window, snapped like the per-tile path
+        sx, sy = cam.world_to_screen((rx0 + tx0 * s) * TILE_SIZE, (ry0 + ty0 * s) * TILE_SIZE)
+        ex, ey = cam.world_to_screen(min(rx0 + tx1 * s, rx1) * TILE_SIZE, min(ry0 + ty1 * s, ry1) * TILE_SIZE)
+        window = self.surfaces[k].subsurface(pygame.Rect(tx0, ty0, tx1 - tx0, ty1 - ty0))
+        surface.blit(pygame.transform.scale(window, (ex - sx, ey - sy)), (sx, sy))
+        return k
@@ -1,13 +1,17 @@
 # --- main.py ---
+import atexit, signal, sys
 import pygame, time
 from camera import Camera
 from player import Player
-from world import World
+from world import create_world
 from profiler import Profiler
 from config import *
 from rendering import Rendering
 from input_handler import InputHandler
 from mini_map import MiniMap
+from timestep import FixedTimestep
+from sim_worker import SnapshotWorld
+from frame_metrics import FrameMetrics
 
 print("hi")
 
@@ -16,11 +20,25 @@ window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
 clock = pygame.time.Clock()
 player = Player((MAP_WIDTH*TILE_SIZE//2, MAP_HEIGHT*TILE_SIZE//2))
 cam = Camera()
-render = Rendering()
-world = World(MAP_WIDTH, MAP_HEIGHT)
-minimap = MiniMap.create_mini_map(world)
-profiler = Profiler()
+cam.fit_map(MAP_WIDTH, MAP_HEIGHT)  # zoom out to the whole map: where the coarse LOD levels show
+world = create_world(MAP_WIDTH, MAP_HEIGHT)
+if SIM_BACKEND == "chunked":
+    world.focus_on(int(player.rect.centerx // TILE_SIZE), int(player.rect.centery // TILE_SIZE))
+if SIM_THREAD:
+    world = SnapshotWorld(world)  # simulation runs on its own thread from here on
+minimap = MiniMap(world)
+minimap.create_mini_map()
+profiler = Profiler(trace_events=PROFILE_TRACE_EVENTS)
+if PROFILE_TRACE_EVENTS:
+    atexit.register(profiler.write_trace, PROFILE_TRACE_FILE)
+metrics = FrameMetrics(METRICS_FILE) if METRICS_FILE else None
+if metrics:
+    atexit.register(metrics.close)
+if PROFILE_TRACE_EVENTS or metrics:
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))  # so a terminated run still writes them
+render = Rendering(profiler)
 input_handler = InputHandler()  # create an instance once, outside the loop
+timestep = FixedTimestep(SIM_HZ, MAX_CATCHUP_TICKS)
 show_minimap = input_handler.is_stick_up()
 
 # Initialize joystick
@@ -40,6 +58,7 @@ else:
 
 
 minimap_timer = 0.0
+tiles_shown = 0  # SIM_THREAD: the worker's tiles_simulated total as of the last frame
 
 
 running = True
@@ -48,8 +67,10 @@ while running:
 
 
 
-    profiler.start('frame')
     dt = clock.tick(FPS)
+    profiler.start('frame')  # after the tick wait: busy time, measured against FRAME_BUDGET_MS
+    if SIM_THREAD:
+        world.begin_frame()
 
 
     # --- Events ---
@@ -58,54 +79,86 @@ while running:
             running = False
         elif e.type == pygame.MOUSEWHEEL:
             cam.target_zoom *= 1.0 + e.y * 0.1
+        elif e.type == pygame.KEYDOWN and e.key == pygame.K_F9 and PROFILE_TRACE_EVENTS:
+            print(f"[PROFILER] trace written to {profiler.write_trace(PROFILE_TRACE_FILE)}")
 
     keys = pygame.key.get_pressed()
 
 
     # --- Update ---
 
-    profiler.start('player_update')
-
-    # --- Controller input ---
+    # --- Controller input (every frame) ---
     player_input_for_movement = input_handler.get_movement()
     action = input_handler.handle_world_action(world, player.rect)
     input_handler.update_buttons()  # refresh current button states
     input_handler.show_pressed_buttons()  # optional: print pressed buttons
-    # Then update the player:
-    player.update(dt, player_input_for_movement, action, world)
-
-    profiler.stop('player_update')
-
-
-
 
-    profiler.start('world_update')
-    world.simulate_step(UPDATE_STEP_LIMIT)
-    profiler.stop('world_update')
+    # --- Simulation (fixed ticks, independent of frame rate) ---
+    tiles_simulated = 0  # by the sweeps that finished this frame
+    for _ in range(timestep.advance(dt)):
+        profiler.start('player_update')
+        player.update(timestep.step_ms, player_input_for_movement, action, world)
+        profiler.stop('player_update')
+
+        profiler.start('world_update')
+        if SIM_BACKEND == "chunked":
+            world.focus_on(int(player.rect.centerx // TILE_SIZE), int(player.rect.centery // TILE_SIZE))
+        if not SIM_THREAD:
+            sweeps = world.sweeps
+            world.simulate_step(world.step_limit)
+            if world.sweeps != sweeps:
+                tiles_simulated += world.active_count  # tiles the finished sweep stepped
+        profiler.stop('world_update')
+    player.interpolate(timestep.alpha)
+    profiler.count('active_tiles', world.active_count)
+    profiler.count('ticks_per_frame', timestep.ticks)
+    profiler.count('dropped_ticks', timestep.dropped)
+    if SIM_THREAD:
+        profiler.count('snapshot_age', world.worker.ticks - world.ticks)  # sim ticks not yet on screen
+        tiles_simulated = world.tiles_simulated - tiles_shown  # sweeps published since the last frame
+        tiles_shown = world.tiles_simulated
 
 
 
     profiler.start('camera_update')
-    cam.update(player.rect)
+    cam.update(player.draw_rect)
     profiler.stop('camera_update')
 
 
     # --- Draw ---
-    window.fill((10, 10, 30))
     profiler.start('render')
-    render.draw_non_player(window, cam, world)
-    player.draw(window, cam)
+    if DIRTY_RECTS:
+        dirty = render.draw_frame(window, cam, world, player)
+    else:
+        window.fill(BACKGROUND_COLOR)
+        render.draw_non_player(window, cam, world)
+        player.draw(window, cam)
+    if SHOW_MINIMAP:
+        profiler.start('minimap')
+        covered = minimap.draw(window, player_rect=player.draw_rect)
+        profiler.stop('minimap')
+        if DIRTY_RECTS:
+            render.mark_dirty(covered)  # repaint under it next frame
+            dirty.append(covered)
     profiler.stop('render')
 
 
-    pygame.display.flip()
+    if DIRTY_RECTS:
+        pygame.display.update(dirty)
+    else:
+        pygame.display.flip()
     profiler.stop('frame')
 
 
 
 
-    if pygame.time.get_ticks() % 3000 < 16:
+    report_due = profiler.end_frame()
+    if metrics:
+        metrics.record(dt, profiler.last('frame'), world.active_count, tiles_simulated, clock.get_fps())
+    if report_due:
         profiler.report()
 
 
+if SIM_THREAD:
+    world.close()
 pygame.quit()
\ No newline at end of file
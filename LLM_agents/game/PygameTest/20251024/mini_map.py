@@ -1,28 +1,74 @@
 import pygame
-from config import MAP_WIDTH, MAP_HEIGHT, TILE_SIZE
-from world import World
-
-# Instantiate the world so minimap has data
-world = World(MAP_WIDTH, MAP_HEIGHT)
+import numpy as np
+from config import TILE_SIZE
+from tiles import PALETTE
 
 class MiniMap:
+    """
+    Persistent 1-pixel-per-tile image of the world (8-bit, PALETTE as its
+    palette). Each draw applies only the tiles the world's change feed
+    reports and rescales only if one of them landed on the map; the player
+    marker is drawn on top, so it never causes a rebuild.
+    """
+
     def __init__(self, world_ref, width=300, height=300):
         self.world = world_ref
         self.width = width
         self.height = height
-        self.surface = None
+        self.region = None  # (x0, y0, x1, y1) tiles in base
+        self.base = None  # 1 px per tile
+        self.surface = None  # base scaled to width x height
+        self.cursor = 0  # position in the world's change feed
+        self.stale = False  # base changed since surface was scaled
+        self.rebuilds = 0
+        self.applied_tiles = 0  # tiles applied by the last update()
 
     def create_mini_map(self):
-        """Builds a minimap surface from current world tile colors."""
-        mini = pygame.Surface((self.world.w, self.world.h))
-        for y in range(self.world.h):
-            for x in range(self.world.w):
-                tile = self.world.tiles[y][x]
-                mini.set_at((x, y), tile.color)
-        # store scaled map for later reuse
-        self.surface = pygame.transform.scale(mini, (self.width, self.height))
+        """Builds the minimap from the current world tile colours."""
+        # whole map, or the loaded area around the player for an endless world
+        self.cursor, _, _ = self.world.changes_since(self.cursor)  # everything up to now is read below
+        self.region = self.world.bounds or self.world.focus_bounds()
+        x0, y0, x1, y1 = self.region
+        self.base = pygame.Surface((x1 - x0, y1 - y0), 0, 8)
+        self.base.set_palette(PALETTE)
+        pygame.surfarray.blit_array(self.base, self.world.index_block(*self.region).T)
+        self.stale = True
+        self.rebuilds += 1
+
+    def update(self):
+        """Apply the tiles that changed since the last update."""
+        region = self.world.bounds or self.world.focus_bounds()
+        if self.base is None or region != self.region:
+            self.create_mini_map()
+            return
+        self.cursor, xs, ys = self.world.changes_since(self.cursor)
+        if xs is None:  # fell behind the feed
+            self.create_mini_map()
+            return
+        x0, y0, x1, y1 = region
+        inside = (xs >= x0) & (xs < x1) & (ys >= y0) & (ys < y1)
+        xs, ys = xs[inside], ys[inside]
+        self.applied_tiles = len(xs)
+        if not len(xs):
+            return
+        bx0, by0 = int(xs.min()), int(ys.min())
+        block = np.asarray(self.world.index_block(bx0, by0, int(xs.max()) + 1, int(ys.max()) + 1))
+        pixels = pygame.surfarray.pixels2d(self.base)
+        pixels[xs - x0, ys - y0] = block[ys - by0, xs - bx0]
+        del pixels  # unlock the surface
+        self.stale = True
 
-    def draw(self, window, pos=(10, 10)):
-        """Draws the minimap if available."""
-        if self.surface:
-            window.blit(self.surface, pos)
+    def draw(self, window, pos=(10, 10), player_rect=None):
+        """Draws the minimap (and the player marker). Returns the screen rect it covered (for dirty-rect updates)."""
+        self.update()
+        if self.stale:
+            self.surface = pygame.transform.scale(self.base, (self.width, self.height))
+            self.stale = False
+        rect = window.blit(self.surface, pos)
+        if player_rect is not None:
+            x0, y0, x1, y1 = self.region
+            mx = rect.x + int((player_rect.centerx / TILE_SIZE - x0) * self.width / (x1 - x0))
+            my = rect.y + int((player_rect.centery / TILE_SIZE - y0) * self.height / (y1 - y0))
+            if rect.collidepoint(mx, my):
+                rect = rect.union(pygame.draw.circle(window, (255, 50, 50), (mx, my), 3))
+        return rect
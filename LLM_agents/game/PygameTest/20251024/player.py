@@ -2,11 +2,14 @@
 import pygame
 import math
 from config import TILE_SIZE
+from collision import move_and_collide
 
 
 class Player:
     def __init__(self, pos):
         self.rect = pygame.Rect(pos[0], pos[1], TILE_SIZE, TILE_SIZE)
+        self.prev_pos = pygame.Vector2(self.rect.topleft)  # position before the last simulation tick
+        self.draw_rect = self.rect.copy()  # interpolated rect used for camera and drawing
         self.color = (220, 60, 60)
 
         # movement physics
@@ -30,13 +33,23 @@ class Player:
         if self.velocity.length() > self.max_speed:
             self.velocity.scale_to_length(self.max_speed)
 
-    def update(self, dt_ms, move_dir, action, cam):
+    def update(self, dt_ms, move_dir, action, world):
         dt = dt_ms / 1000.0
+        self.prev_pos.update(self.rect.topleft)
         self.apply_physics(move_dir, dt)
 
-        self.rect.x += self.velocity.x * dt
-        self.rect.y += self.velocity.y * dt
+        # move, stopping at obstacle tiles (only the tiles swept through are checked)
+        hit_x, hit_y = move_and_collide(self.rect, int(self.velocity.x * dt), int(self.velocity.y * dt), world.is_obstacle)
+        if hit_x:
+            self.velocity.x = 0
+        if hit_y:
+            self.velocity.y = 0
+
+    def interpolate(self, alpha):
+        """Place draw_rect alpha (0..1) of the way from the previous tick's position to the current one."""
+        pos = self.prev_pos.lerp(self.rect.topleft, alpha)
+        self.draw_rect.topleft = (round(pos.x), round(pos.y))
 
     def draw(self, surf, cam):
-        pygame.draw.rect(surf, self.color, cam.apply(self.rect))
+        pygame.draw.rect(surf, self.color, cam.apply(self.draw_rect))
 
@@ -1,26 +1,231 @@
 # -------------------- profiler.py --------------------
-import time
+import json, os
+from array import array
+from time import perf_counter_ns
+from config import FRAME_BUDGET_MS, PROFILE_WINDOW, PROFILE_REPORT_MS
 
-class Profiler:
-    def __init__(self):
-        self.data = {}
+# ==========================================================
+# == FRAME PROFILER
+# ==========================================================
+# start(name) / stop(name) add a section's time to this frame's total;
+# sections may nest (and repeat, e.g. once per simulation tick). end_frame()
+# moves every total into that section's ring buffer of the last `window`
+# frames, which report() turns into p50/p95/p99/max. Sections with a budget
+# (by default 'frame' against FRAME_BUDGET_MS) also count the frames that
+# went over it. The open-section stack is preallocated, so start/stop only
+# read the clock and touch a few list slots and one dict entry.
+#
+# With trace_events > 0 every stop() also lands in a ring buffer of the
+# newest trace_events (section, start, duration, frame) records, and
+# write_trace() dumps them as a Chrome trace_event file (chrome://tracing,
+# Perfetto, speedscope) to see which frame spiked and in which section.
 
+MAX_DEPTH = 32
+
+
+class Section:
+    __slots__ = ("name", "parent", "depth", "samples", "frames", "budget_ns", "overruns", "window_overruns")
+
+    def __init__(self, name, parent, depth, window, budget_ms=None):
+        self.name = name
+        self.parent = parent  # enclosing section when first seen, or None
+        self.depth = depth
+        self.samples = array("q", bytes(8 * window))  # ns per frame, ring buffer
+        self.frames = 0  # samples written in total
+        self.budget_ns = None if budget_ms is None else int(budget_ms * 1e6)
+        self.overruns = 0  # frames over budget, in total
+        self.window_overruns = array("b", bytes(window))  # 1 where that sample went over
 
-    def start(self, name):
-        self.data[name] = {'start': time.time(), 'elapsed': self.data.get(name, {}).get('elapsed', 0)}
 
+class Profiler:
+    def __init__(self, window=PROFILE_WINDOW, budgets=None, report_ms=PROFILE_REPORT_MS, trace_events=0):
+        self.window = window
+        self.budgets = {"frame": FRAME_BUDGET_MS} if budgets is None else budgets
+        self.report_ns = int(report_ms * 1e6)
+        self.sections = {}  # name -> Section, in first-seen order
+        self.totals = {}  # name -> ns spent in this frame so far
+        self.counters = {}
+        self.frame = 0
+        self._names = [None] * MAX_DEPTH
+        self._starts = [0] * MAX_DEPTH
+        self._depth = 0
+        self._last_report = perf_counter_ns()
+        self.trace_events = trace_events
+        if trace_events:
+            self._trace_ids = {}  # section name -> index into _trace_names
+            self._trace_names = []
+            self._trace_section = array("i", bytes(4 * trace_events))
+            self._trace_start = array("q", bytes(8 * trace_events))
+            self._trace_dur = array("q", bytes(8 * trace_events))
+            self._trace_frame = array("q", bytes(8 * trace_events))
+            self._traced = 0  # events recorded in total
+            self._t0 = perf_counter_ns()
+            self.stop = self._stop_traced  # plain stop() stays free of the check
+
+    def start(self, name):
+        d = self._depth
+        self._names[d] = name
+        self._depth = d + 1
+        self._starts[d] = perf_counter_ns()  # last, so the bookkeeping above isn't timed
 
     def stop(self, name):
-        if name in self.data and 'start' in self.data[name]:
-            elapsed = (time.time() - self.data[name]['start']) * 1000
-            self.data[name]['elapsed'] += elapsed
-            self.data[name]['start'] = None
+        now = perf_counter_ns()
+        d = self._depth - 1
+        if d < 0 or self._names[d] != name:
+            d = self._unwind(name)
+            if d < 0:
+                return  # never started: ignore, like before
+        self._depth = d
+        try:
+            self.totals[name] += now - self._starts[d]
+        except KeyError:
+            self._add_section(name, d, now - self._starts[d])
+
+    def _stop_traced(self, name):
+        now = perf_counter_ns()
+        d = self._depth - 1
+        if d < 0 or self._names[d] != name:
+            d = self._unwind(name)
+            if d < 0:
+                return
+        self._depth = d
+        started = self._starts[d]
+        try:
+            self.totals[name] += now - started
+        except KeyError:
+            self._add_section(name, d, now - started)
+        i = self._traced % self.trace_events
+        section = self._trace_ids.get(name)
+        if section is None:
+            section = self._trace_ids[name] = len(self._trace_names)
+            self._trace_names.append(name)
+        self._trace_section[i] = section
+        self._trace_start[i] = started
+        self._trace_dur[i] = now - started
+        self._trace_frame[i] = self.frame
+        self._traced += 1
+
+    def _unwind(self, name):
+        """Depth of the innermost open `name`; sections opened inside it and never stopped are dropped."""
+        for d in range(self._depth - 1, -1, -1):
+            if self._names[d] == name:
+                return d
+        return -1
 
+    def _add_section(self, name, depth, elapsed):
+        parent = self._names[depth - 1] if depth else None
+        self.sections[name] = Section(name, parent, depth, self.window, self.budgets.get(name))
+        self.totals[name] = elapsed
+
+    def count(self, name, value):
+        """Record a per-frame counter (e.g. active tiles) shown with the next report."""
+        self.counters[name] = value
+
+    def last(self, name):
+        """ms spent in a section during the last closed frame (0.0 if it never ran)."""
+        section = self.sections.get(name)
+        if section is None or not self.frame:
+            return 0.0
+        return section.samples[(self.frame - 1) % self.window] / 1e6
+
+    def end_frame(self):
+        """Close the frame: totals go into the ring buffers. Returns True when a report is due."""
+        i = self.frame % self.window
+        totals = self.totals
+        for name, section in self.sections.items():
+            ns = totals[name]
+            totals[name] = 0
+            section.samples[i] = ns
+            section.frames += 1
+            over = section.budget_ns is not None and ns > section.budget_ns
+            section.window_overruns[i] = over
+            section.overruns += over
+        self.frame += 1
+        if perf_counter_ns() - self._last_report >= self.report_ns:
+            self._last_report = perf_counter_ns()
+            return True
+        return False
+
+    # -----------------------------
+    # == Reporting
+    # -----------------------------
+    def _tree(self, parent=None):
+        """Sections in report order: each one followed by the sections nested in it."""
+        for section in self.sections.values():
+            if section.parent == parent and section.name != parent:
+                yield section
+                yield from self._tree(section.name)
+
+    def _recent(self, ring, n):
+        """The last n frames' entries of a per-section ring buffer."""
+        return [ring[i % self.window] for i in range(self.frame - n, self.frame)]
+
+    def stats(self, name):
+        """p50/p95/p99/max in ms over the window, plus overrun counts; None before the first frame."""
+        section = self.sections[name]
+        n = min(section.frames, self.window)
+        if not n:
+            return None
+        samples = sorted(self._recent(section.samples, n))
+
+        def pct(p):
+            return samples[min(n - 1, int(p * n))] / 1e6
+
+        return {
+            "frames": n,
+            "p50": pct(0.50),
+            "p95": pct(0.95),
+            "p99": pct(0.99),
+            "max": samples[-1] / 1e6,
+            "overruns": sum(self._recent(section.window_overruns, n)),
+            "total_overruns": section.overruns,
+        }
 
     def report(self):
-        print("--- Performance Report (ms/frame) ---")
-        for name, val in self.data.items():
-            print(f"{name:<15}: {val['elapsed']:.2f} ms")
-            print("------------------------------------\n")
-            for name in self.data:
-                self.data[name]['elapsed'] = 0
\ No newline at end of file
+        print(f"--- Performance Report (ms/frame, last {min(self.frame, self.window)} frames) ---")
+        print(f"{'section':<22}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}  over budget")
+        for section in self._tree():
+            s = self.stats(section.name)
+            if s is None:
+                continue
+            over = ""
+            if section.budget_ns is not None:
+                over = f"  {s['overruns']}/{s['frames']} ({s['total_overruns']} total, budget {section.budget_ns / 1e6:.1f} ms)"
+            label = "  " * section.depth + section.name
+            print(f"{label:<22}{s['p50']:8.2f}{s['p95']:8.2f}{s['p99']:8.2f}{s['max']:8.2f}{over}")
+        for name, value in self.counters.items():
+            print(f"{name:<22}: {value}")
+        print("------------------------------------\n")
+
+    # -----------------------------
+    # == Trace export
+    # -----------------------------
+    def trace(self):
+        """The buffered events (oldest first) as a Chrome trace_event document."""
+        events = [{"name": "process_name", "ph": "M", "pid": os.getpid(), "args": {"name": "game"}}]
+        n = min(self._traced, self.trace_events) if self.trace_events else 0
+        for k in range(self._traced - n, self._traced):
+            i = k % self.trace_events
+            events.append({
+                "name": self._trace_names[self._trace_section[i]],
+                "ph": "X",
+                "ts": (self._trace_start[i] - self._t0) / 1000,  # us
+                "dur": self._trace_dur[i] / 1000,
+                "pid": os.getpid(),
+                "tid": 0,
+                "args": {"frame": self._trace_frame[i]},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms",
+                "otherData": {"dropped_events": max(0, self._traced - n)}}
+
+    def write_trace(self, path):
+        """Write trace() to path (atomically). Returns the path, or None if tracing is off."""
+        if not self.trace_events:
+            return None
+        path = os.fspath(path)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.trace(), f)
+        os.replace(tmp, path)
+        return path
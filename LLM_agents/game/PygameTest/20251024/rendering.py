@@ -1,28 +1,290 @@
 import pygame
 import math
-from config import WINDOW_WIDTH, WINDOW_HEIGHT, TILE_SIZE
+import numpy as np
+from config import WINDOW_WIDTH, WINDOW_HEIGHT, TILE_SIZE, RENDER_MODE, RENDER_CHUNK_TILES, BACKGROUND_COLOR, DIRTY_CELL_TILES, MAX_DIRTY_RECTS
+from tiles import VOID_COLOR, VOID_INDEX, PALETTE, unpack_color
+from lod import LodPyramid
 
+COLOR_KEY = 0xFF00FF  # stands in for VOID_COLOR inside chunk surfaces
+RGB_MASKS = (0xFF0000, 0x00FF00, 0x0000FF, 0)  # packed 0xRRGGBB == pixel value
 
 
-class Rendering:
+class ChunkSurface:
+    """Cached 1-pixel-per-tile image of one chunk, plus its copy at the current zoom."""
+
+    __slots__ = ("colors", "base", "scaled", "scaled_size")
+
     def __init__(self):
-        pass # nothing to draw at creation
+        self.colors = None
+        self.base = None
+        self.scaled = None
+        self.scaled_size = 0
+
+
+class FrameState:
+    """What the previous dirty-rect frame put on screen."""
+
+    __slots__ = ("offset", "zoom", "size", "player_rect", "tiles", "indices")
+
+    def __init__(self, offset, zoom, size, player_rect, tiles, indices):
+        self.offset = offset
+        self.zoom = zoom
+        self.size = size
+        self.player_rect = player_rect
+        self.tiles = tiles  # (x0, y0, x1, y1) window the indices were read from
+        self.indices = indices
+
+
+class Rendering:
+    def __init__(self, profiler=None, mode=RENDER_MODE):
+        self.profiler = profiler
+        self.mode = mode
+        self.chunks = {}  # (cx, cy) -> ChunkSurface
+        self.index_surface = None  # 8-bit, 1 pixel per visible tile, PALETTE as its palette
+        self.lod = LodPyramid()
+        self.last_frame = None  # FrameState of the last draw_frame()
+        self.pending = []  # screen rects marked dirty by overlays since the last frame
+
+
+
+
+    def visible_tiles(self, cam, world, area=None):
+        """(x0, y0, x1, y1) tile window under the screen rect area (default: the whole window)."""
+        area = area or pygame.Rect(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)
+        ox, oy = cam.offset()
+        span = TILE_SIZE * cam.zoom
+        x0 = int((ox + area.left) // span)
+        y0 = int((oy + area.top) // span)
+        x1 = int(math.ceil((ox + area.right) / span))
+        y1 = int(math.ceil((oy + area.bottom) / span))
+        if world.bounds is not None:  # endless worlds have no edge to clamp to
+            bx0, by0, bx1, by1 = world.bounds
+            x0, y0, x1, y1 = max(bx0, x0), max(by0, y0), min(bx1, x1), min(by1, y1)
+        return x0, y0, x1, y1
+
+    def draw_non_player(self, surface, cam, world, area=None, sync=True):
+        """Draw the tiles under area (a screen rect, default everything). sync=False skips the LOD refresh."""
+        x0, y0, x1, y1 = self.visible_tiles(cam, world, area)
+        if x0 >= x1 or y0 >= y1:
+            return
+        clip = surface.get_clip()
+        if area is not None:
+            surface.set_clip(area.clip(clip))
+        try:
+            self._draw_tiles(surface, cam, world, x0, y0, x1, y1, sync, area is None)
+        finally:
+            surface.set_clip(clip)
+
+    def _draw_tiles(self, surface, cam, world, x0, y0, x1, y1, sync, full):
+        if self.mode == "chunks":
+            self.draw_chunks(surface, cam, world, x0, y0, x1, y1, prune=full)
+            return
+        if self.mode == "surfarray":
+            self.draw_indexed(surface, cam, world, x0, y0, x1, y1)
+            return
+        if self.mode == "lod":
+            self.draw_lod(surface, cam, world, x0, y0, x1, y1, sync)
+            return
+
+        colors = world.color_block(x0, y0, x1, y1)
+        xs, ys = (edges.tolist() for edges in cam.project_tiles(x0, y0, x1, y1))
+        for j, row in enumerate(colors.tolist()):
+            top, height = ys[j], ys[j + 1] - ys[j]
+            for i, c in enumerate(row):
+                if c == VOID_COLOR:
+                    continue  # outside the map / chunk not loaded
+                surface.fill(unpack_color(c), (xs[i], top, xs[i + 1] - xs[i], height))
+
+    # -----------------------------
+    # == Dirty-rect frames
+    # -----------------------------
+    def mark_dirty(self, rect):
+        """Screen area an overlay (HUD, minimap) drew over: repainted and pushed with the next frame."""
+        self.pending.append(pygame.Rect(rect))
+
+    def draw_frame(self, surface, cam, world, player):
+        """
+        Draw the next frame touching only what changed and return the screen
+        rects for pygame.display.update(). A moved camera scrolls the previous
+        frame by the pixel delta and only paints the exposed strips; zoom
+        changes or too many changed tiles fall back to a full redraw.
+        """
+        view = surface.get_rect()
+        offset = cam.offset()
+        tiles = self.visible_tiles(cam, world)
+        if self.mode == "lod":
+            self.lod.sync(world, world.bounds or world.focus_bounds())
+        indices = np.array(world.index_block(*tiles)) if tiles[0] < tiles[2] and tiles[1] < tiles[3] else None
+
+        last = self.last_frame
+        areas = None
+        if last is not None and last.zoom == cam.zoom and last.size == view.size:
+            dx, dy = last.offset[0] - offset[0], last.offset[1] - offset[1]
+            if abs(dx) < view.w and abs(dy) < view.h:
+                areas = self._scroll(surface, view, dx, dy)
+                areas.append(last.player_rect.move(dx, dy))
+                areas += [r.move(dx, dy) for r in self.pending]  # overlays scrolled with the frame
+                areas += self._changed_tile_areas(cam, last, tiles, indices)
+                if len(areas) > MAX_DIRTY_RECTS:
+                    areas = None
+
+        if areas is None:
+            surface.fill(BACKGROUND_COLOR)
+            self.draw_non_player(surface, cam, world, sync=False)
+            dirty = [view]
+        else:
+            for area in areas:
+                area = area.clip(view)
+                if area.width and area.height:
+                    surface.fill(BACKGROUND_COLOR, area)
+                    self.draw_non_player(surface, cam, world, area, sync=False)
+            dirty = [view] if (dx or dy) else [a.clip(view) for a in areas]
+
+        player_rect = cam.apply(player.draw_rect)
+        player.draw(surface, cam)
+        dirty.append(player_rect.clip(view))
+
+        self.last_frame = FrameState(offset, cam.zoom, view.size, player_rect, tiles, indices)
+        self.pending = []
+        if self.profiler is not None:
+            self.profiler.count('dirty_rects', len(dirty))
+        return dirty
+
+    @staticmethod
+    def _scroll(surface, view, dx, dy):
+        """Move the framebuffer by (dx, dy); returns the exposed strips."""
+        if not (dx or dy):
+            return []
+        surface.scroll(dx, dy)
+        strips = []
+        if dx > 0:
+            strips.append(pygame.Rect(0, 0, dx, view.h))
+        elif dx < 0:
+            strips.append(pygame.Rect(view.w + dx, 0, -dx, view.h))
+        if dy > 0:
+            strips.append(pygame.Rect(0, 0, view.w, dy))
+        elif dy < 0:
+            strips.append(pygame.Rect(0, view.h + dy, view.w, -dy))
+        return strips
+
+    def _changed_tile_areas(self, cam, last, tiles, indices):
+        """Screen rects of DIRTY_CELL_TILES cells holding a tile whose colour changed since last frame."""
+        if indices is None or last.indices is None:
+            return []
+        x0, y0 = max(tiles[0], last.tiles[0]), max(tiles[1], last.tiles[1])
+        x1, y1 = min(tiles[2], last.tiles[2]), min(tiles[3], last.tiles[3])
+        if x0 >= x1 or y0 >= y1:
+            return []
+        now = indices[y0 - tiles[1]:y1 - tiles[1], x0 - tiles[0]:x1 - tiles[0]]
+        before = last.indices[y0 - last.tiles[1]:y1 - last.tiles[1], x0 - last.tiles[0]:x1 - last.tiles[0]]
+        ys, xs = np.nonzero(now != before)
+        if not len(ys):
+            return []
+
+        cell = DIRTY_CELL_TILES
+        if self.mode == "lod":
+            cell = max(cell, 1 << self.lod.level_for(cam.zoom))  # one coarse texel spans many tiles
+        cells = set(zip(((xs + x0) // cell).tolist(), ((ys + y0) // cell).tolist()))
+        cx0, cy0 = min(c[0] for c in cells), min(c[1] for c in cells)
+        cx1, cy1 = max(c[0] for c in cells) + 1, max(c[1] for c in cells) + 1
+        col_edges, row_edges = cam.project_tiles(cx0 * cell, cy0 * cell, cx1 * cell, cy1 * cell)
+        col_edges, row_edges = col_edges[::cell].tolist(), row_edges[::cell].tolist()
+        areas = []
+        for cx, cy in cells:
+            sx, ex = col_edges[cx - cx0], col_edges[cx - cx0 + 1]
+            sy, ey = row_edges[cy - cy0], row_edges[cy - cy0 + 1]
+            areas.append(pygame.Rect(sx, sy, ex - sx, ey - sy))
+            if len(areas) > MAX_DIRTY_RECTS:
+                break  # caller falls back to a full redraw
+        return areas
+
+    # -----------------------------
+    # == Colour-index surface
+    # -----------------------------
+    def draw_indexed(self, surface, cam, world, x0, y0, x1, y1):
+        """Visible tiles -> one 8-bit pixel each (blit_array) -> a single scale to screen size."""
+        indices = world.index_block(x0, y0, x1, y1)
+        w, h = x1 - x0, y1 - y0
+        if self.index_surface is None or self.index_surface.get_size() != (w, h):
+            self.index_surface = pygame.Surface((w, h), 0, 8)
+            self.index_surface.set_palette(PALETTE)
+        pygame.surfarray.blit_array(self.index_surface, indices.T)
+        self.index_surface.set_colorkey(PALETTE[VOID_INDEX] if (indices == VOID_INDEX).any() else None)
+
+        # snap both edges to the same pixels the per-tile path would use
+        sx, sy = cam.world_to_screen(x0 * TILE_SIZE, y0 * TILE_SIZE)
+        ex, ey = cam.world_to_screen(x1 * TILE_SIZE, y1 * TILE_SIZE)
+        surface.blit(pygame.transform.scale(self.index_surface, (ex - sx, ey - sy)), (sx, sy))
 
+    # -----------------------------
+    # == LOD pyramid
+    # -----------------------------
+    def draw_lod(self, surface, cam, world, x0, y0, x1, y1, sync=True):
+        """Scale the visible part of the pyramid level matching the zoom; only dirty texels are rebuilt."""
+        region = world.bounds or world.focus_bounds()  # endless world: the loaded area
+        if sync or region != self.lod.region:
+            self.lod.sync(world, region)
+        x0, y0 = max(x0, region[0]), max(y0, region[1])
+        x1, y1 = min(x1, region[2]), min(y1, region[3])
+        if x0 >= x1 or y0 >= y1:
+            return
+        level = self.lod.draw(surface, cam, x0, y0, x1, y1)
+        if self.profiler is not None:
+            self.profiler.count('lod_level', level)
+            self.profiler.count('lod_texels', self.lod.rebuilt_texels)
 
+    # -----------------------------
+    # == Chunk surface cache
+    # -----------------------------
+    def draw_chunks(self, surface, cam, world, x0, y0, x1, y1, prune=True):
+        """Blit one cached surface per visible chunk; rebuild only chunks whose colours changed."""
+        c = RENDER_CHUNK_TILES
+        size = math.ceil(c * TILE_SIZE * cam.zoom)  # on-screen chunk size, also the scale cache key
+        visible = set()
+        hits = rebuilds = 0
 
+        for cy in range(y0 // c, (y1 - 1) // c + 1):
+            for cx in range(x0 // c, (x1 - 1) // c + 1):
+                colors = world.color_block(cx * c, cy * c, (cx + 1) * c, (cy + 1) * c)
+                if (colors == VOID_COLOR).all():
+                    continue
+                visible.add((cx, cy))
+                entry = self.chunks.get((cx, cy))
+                if entry is None:
+                    entry = self.chunks[(cx, cy)] = ChunkSurface()
 
-    def draw_non_player(self, surface, cam, world):
-        vis_rect_world = pygame.Rect(cam.pos.x, cam.pos.y, WINDOW_WIDTH / cam.zoom, WINDOW_HEIGHT / cam.zoom)
-        x0 = max(0, int(vis_rect_world.left // TILE_SIZE))
-        y0 = max(0, int(vis_rect_world.top // TILE_SIZE))
-        x1 = min(world.w, int(math.ceil(vis_rect_world.right / TILE_SIZE)))
-        y1 = min(world.h, int(math.ceil(vis_rect_world.bottom / TILE_SIZE)))
+                if entry.colors is None or not np.array_equal(entry.colors, colors):
+                    self._build_base(entry, colors)
+                    rebuilds += 1
+                elif entry.scaled_size == size:
+                    hits += 1
+                if entry.scaled_size != size:
+                    entry.scaled = pygame.transform.scale(entry.base, (size, size))
+                    entry.scaled_size = size
 
+                surface.blit(entry.scaled, cam.world_to_screen(cx * c * TILE_SIZE, cy * c * TILE_SIZE))
 
+        if not prune:
+            return  # partial redraw: the rest of the view is still on screen
+        # off-screen chunks keep their small base image but drop the scaled copy
+        for key in self.chunks.keys() - visible:
+            entry = self.chunks[key]
+            if entry.scaled is not None:
+                entry.scaled, entry.scaled_size = None, 0
+        if len(self.chunks) > 4 * max(1, len(visible)) + 64:
+            self.chunks = {key: self.chunks[key] for key in visible}
 
+        if self.profiler is not None:
+            self.profiler.count('chunk_hit_rate', f"{hits / len(visible):.0%}" if visible else "-")
+            self.profiler.count('chunk_rebuilds', rebuilds)
 
-        for y in range(y0, y1):
-            row = world.tiles[y]
-        for x in range(x0, x1):
-            t = row[x]
-            surface.fill(t.color, cam.apply(t.rect))
\ No newline at end of file
+    def _build_base(self, entry, colors):
+        entry.colors = colors  # color_block() hands out a fresh array, safe to keep
+        base = pygame.Surface(colors.shape[::-1], 0, 32, RGB_MASKS)
+        void = colors == VOID_COLOR
+        if void.any():
+            colors = np.where(void, np.uint32(COLOR_KEY), colors)
+            base.set_colorkey(unpack_color(COLOR_KEY))
+        pygame.surfarray.blit_array(base, colors.T)
+        entry.base = base
+        entry.scaled, entry.scaled_size = None, 0
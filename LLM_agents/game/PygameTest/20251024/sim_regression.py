@@ -0,0 +1,96 @@
+# -------------------- sim_regression.py --------------------
+# Determinism check for the double-buffered simulation.
+#
+#   python sim_regression.py            -> compare against sim_checksums.json
+#   python sim_regression.py --update   -> record new checksums
+#
+# Every backend is run with several per-frame budgets; all of them must end
+# in the same state after N sweeps, and that state must match the recorded one.
+import argparse, hashlib, json, sys
+from pathlib import Path
+
+import numpy as np
+
+from world import World
+from world_np import NumpyWorld
+from world_parallel import ParallelWorld
+
+CHECKSUM_FILE = Path(__file__).resolve().parent / "sim_checksums.json"
+
+BACKENDS = {
+    "python": (lambda size, seed: World(size, size, double_buffered=True, active_scheduling=False, seed=seed), [97, 1000, 6000, None]),
+    "python-active": (lambda size, seed: World(size, size, double_buffered=True, active_scheduling=True, seed=seed), [97, 1000, None]),
+    "numpy": (lambda size, seed: NumpyWorld(size, size, active_scheduling=False, seed=seed), [1, 500, 2000, None]),
+    "numpy-active": (lambda size, seed: NumpyWorld(size, size, active_scheduling=True, seed=seed), [1, 500, None]),
+    "parallel": (lambda size, seed: ParallelWorld(size, size, workers=2, chunk_size=16, seed=seed), [None]),
+}
+
+
+def world_checksum(world):
+    """sha256 over heat/water/earth/nature/color of every tile, row-major."""
+    fields = [
+        np.array([[getattr(t, name) for t in row] for row in world.tiles], dtype=np.float64)
+        for name in ("heat", "water", "earth", "nature")
+    ]
+    colors = np.array([[t.color for t in row] for row in world.tiles], dtype=np.uint8)
+    digest = hashlib.sha256()
+    for a in fields + [colors]:
+        digest.update(np.ascontiguousarray(a).tobytes())
+    return digest.hexdigest()
+
+
+def run(backend, seed, size, sweeps, budget):
+    make, _ = BACKENDS[backend]
+    world = make(size, seed)
+    budget = budget or size * size
+    try:
+        while world.sweeps < sweeps:
+            world.simulate_step(budget)
+        return world_checksum(world)
+    finally:
+        if hasattr(world, "close"):
+            world.close()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Check that the simulation is deterministic.")
+    ap.add_argument("--seed", type=int, default=1234)
+    ap.add_argument("--size", type=int, default=48)
+    ap.add_argument("--steps", type=int, default=25, help="full sweeps to simulate")
+    ap.add_argument("--update", action="store_true", help="rewrite the recorded checksums")
+    args = ap.parse_args(argv)
+
+    recorded = json.loads(CHECKSUM_FILE.read_text(encoding="utf-8")) if CHECKSUM_FILE.exists() else {}
+    key = f"seed={args.seed} size={args.size} steps={args.steps}"
+    ok = True
+
+    for backend, (_, budgets) in BACKENDS.items():
+        sums = {budget: run(backend, args.seed, args.size, args.steps, budget) for budget in budgets}
+        first = next(iter(sums.values()))
+        for budget, digest in sums.items():
+            print(f"{backend:<13} budget={str(budget):<6} {digest[:16]}")
+
+        if len(set(sums.values())) != 1:
+            print(f"[FAIL] {backend}: result depends on the budget")
+            ok = False
+            continue
+
+        expected = recorded.get(backend, {}).get(key)
+        if args.update:
+            recorded.setdefault(backend, {})[key] = first
+        elif expected is None:
+            print(f"[SKIP] {backend}: no recorded checksum for {key} (run with --update)")
+        elif expected != first:
+            print(f"[FAIL] {backend}: checksum changed ({expected[:16]} -> {first[:16]})")
+            ok = False
+
+    if args.update:
+        CHECKSUM_FILE.write_text(json.dumps(recorded, indent=2) + "\n", encoding="utf-8")
+        print(f"Recorded checksums in {CHECKSUM_FILE}")
+
+    print("OK" if ok else "FAILED")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
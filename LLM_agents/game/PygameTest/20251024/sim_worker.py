@@ -0,0 +1,163 @@
+# -------------------- sim_worker.py --------------------
+import atexit, queue, threading, time
+import numpy as np
+from config import SIM_HZ, MAX_CATCHUP_TICKS
+from tiles import VOID_INDEX
+from timestep import FixedTimestep
+from world_np import PALETTE_PACKED, clip_block
+
+# ==========================================================
+# == BACKGROUND SIMULATION
+# ==========================================================
+# SimulationThread owns the real world and steps it at SIM_HZ on its own
+# clock. After every batch of ticks it publishes an immutable WorldSnapshot
+# (colour indices + packed obstacle bits of the visible region) by swapping
+# one attribute, which is atomic, so readers never lock. Edits go the other
+# way through a command queue and are applied between ticks.
+#
+# SnapshotWorld is what the render loop holds instead of the world: the
+# same read API (bounds, index_block, color_block, is_obstacle, ...) served
+# from the snapshot pinned by begin_frame(), and edit_nature / focus_on
+# turned into commands. changes_since() reads the world's (locked) change
+# feed, cut off at the batch the pinned snapshot was taken at.
+
+
+class WorldSnapshot:
+    __slots__ = ("region", "color_index", "obstacle_bits", "tick", "active_count", "change_seq", "tiles_simulated")
+
+    def __init__(self, region, color_index, obstacle_bits, tick, active_count, change_seq, tiles_simulated):
+        self.region = region  # (x0, y0, x1, y1) in tiles
+        self.color_index = color_index
+        self.obstacle_bits = obstacle_bits  # np.packbits(..., axis=1) of the obstacle grid
+        self.tick = tick
+        self.active_count = active_count
+        self.change_seq = change_seq  # world.changes.seq when this was taken
+        self.tiles_simulated = tiles_simulated  # tiles stepped by all sweeps finished so far
+
+
+class SimulationThread(threading.Thread):
+    def __init__(self, world, hz=SIM_HZ):
+        super().__init__(name="simulation", daemon=True)
+        self.world = world
+        self.timestep = FixedTimestep(hz, MAX_CATCHUP_TICKS)
+        self.budget = world.step_limit  # the wrapped world's own, whatever SIM_BACKEND says
+        self.commands = queue.SimpleQueue()
+        self.ticks = 0
+        self.tiles_simulated = 0  # running total over finished sweeps, like main.py's per-frame count
+        self.latest = None
+        self._stop_event = threading.Event()
+        self.publish()
+
+    def send(self, name, *args):
+        """Queue world.<name>(*args) to run before the next tick."""
+        self.commands.put((name, args))
+
+    def run(self):
+        last = time.perf_counter()
+        while not self._stop_event.is_set():
+            now = time.perf_counter()
+            ticks = self.timestep.advance((now - last) * 1000.0)
+            last = now
+            for _ in range(ticks):
+                self._apply_commands()
+                sweeps = self.world.sweeps
+                self.world.simulate_step(self.budget)
+                if self.world.sweeps != sweeps:
+                    self.tiles_simulated += self.world.active_count  # tiles the finished sweep stepped
+                self.ticks += 1
+            if ticks:
+                self.publish()
+            self._stop_event.wait(max(0.0, (self.timestep.step_ms - self.timestep.accumulator) / 1000.0))
+
+    def _apply_commands(self):
+        while True:
+            try:
+                name, args = self.commands.get_nowait()
+            except queue.Empty:
+                return
+            getattr(self.world, name)(*args)
+
+    def publish(self):
+        world = self.world
+        region = world.bounds or world.focus_bounds()
+        self.latest = WorldSnapshot(
+            region,
+            np.array(world.index_block(*region)),
+            np.packbits(world.obstacle_block(*region), axis=1),
+            self.ticks,
+            world.active_count,
+            world.changes.seq,
+            self.tiles_simulated,
+        )
+
+    def stop(self):
+        self._stop_event.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout=5)
+
+
+class SnapshotWorld:
+    """Read-only view of a world stepped by a SimulationThread."""
+
+    def __init__(self, world, hz=SIM_HZ):
+        self.bounded = world.bounds is not None
+        self.worker = SimulationThread(world, hz)
+        self.snapshot = self.worker.latest
+        self.worker.start()
+        atexit.register(self.close)
+
+    def begin_frame(self):
+        """Pin the newest complete snapshot so the whole frame sees one state."""
+        self.snapshot = self.worker.latest
+
+    # -----------------------------
+    # == Reads (from the pinned snapshot)
+    # -----------------------------
+    @property
+    def bounds(self):
+        return self.snapshot.region if self.bounded else None
+
+    def focus_bounds(self):
+        return self.snapshot.region
+
+    @property
+    def active_count(self):
+        return self.snapshot.active_count
+
+    @property
+    def ticks(self):
+        return self.snapshot.tick
+
+    @property
+    def tiles_simulated(self):
+        return self.snapshot.tiles_simulated
+
+    def index_block(self, x0, y0, x1, y1):
+        rx0, ry0, rx1, ry1 = self.snapshot.region
+        return clip_block(self.snapshot.color_index, x0 - rx0, y0 - ry0, x1 - rx0, y1 - ry0, VOID_INDEX)
+
+    def color_block(self, x0, y0, x1, y1):
+        return PALETTE_PACKED[self.index_block(x0, y0, x1, y1)]
+
+    def is_obstacle(self, x, y):
+        rx0, ry0, rx1, ry1 = self.snapshot.region
+        if not (rx0 <= x < rx1 and ry0 <= y < ry1):
+            return False
+        x, y = x - rx0, y - ry0
+        return bool((self.snapshot.obstacle_bits[y, x >> 3] >> (7 - (x & 7))) & 1)
+
+    def changes_since(self, cursor):
+        """The world's change feed, cut off at the pinned snapshot."""
+        return self.worker.world.changes.since(cursor, upto=self.snapshot.change_seq)
+
+    # -----------------------------
+    # == Writes (queued for the worker)
+    # -----------------------------
+    def edit_nature(self, x, y, delta):
+        self.worker.send("edit_nature", x, y, delta)
+
+    def focus_on(self, x, y):
+        self.worker.send("focus_on", x, y)
+
+    def close(self):
+        self.worker.stop()
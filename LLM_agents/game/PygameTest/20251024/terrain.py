@@ -0,0 +1,130 @@
+# -------------------- terrain.py --------------------
+import hashlib, os, random, threading
+from pathlib import Path
+import numpy as np
+import config
+
+# ==========================================================
+# == TERRAIN GENERATION
+# ==========================================================
+# Vectorized gradient noise with the same shape as perlin_noise.PerlinNoise
+# (one lattice per `octaves` units, fade(1-|d|) corner weights), evaluated
+# for a whole grid at once. Lattice gradients come from an integer hash of
+# (seed, ix, iy), so a seed always gives the same terrain on any machine.
+
+ELEV_OCTAVES, TEMP_OCTAVES = 4, 3
+ELEV_SCALE, TEMP_SCALE = 2.3, 3.1
+ISLAND_RADIUS, ISLAND_FALLOFF = 0.72, 0.85
+TEMP_BASE, TEMP_RANGE = 300, 18
+OPEN_WORLD_SCALE, CONTINENT_SCALE = 150, 0.6
+GENERATOR_VERSION = 1  # bump when the noise itself changes so stale caches are ignored
+
+CACHE_DIR = Path(__file__).resolve().parent / "state" / "world_cache"
+
+_M1 = np.uint64(0x9E3779B97F4A7C15)
+_M2 = np.uint64(0xC2B2AE3D27D4EB4F)
+_M3 = np.uint64(0xFF51AFD7ED558CCD)
+_M4 = np.uint64(0xC4CEB9FE1A85EC53)
+
+
+def _mix(h):
+    h = h ^ (h >> np.uint64(33))
+    h = h * _M3
+    h = h ^ (h >> np.uint64(33))
+    h = h * _M4
+    return h ^ (h >> np.uint64(33))
+
+
+def _gradients(ix, iy, seed):
+    """Unit gradient vector for every lattice point (ix, iy)."""
+    h = ix.astype(np.int64).view(np.uint64) * _M1
+    h = h ^ (iy.astype(np.int64).view(np.uint64) * _M2)
+    seed_key = (seed * 0x9E3779B97F4A7C15 + 0x632BE59BD9B4E019) & 0xFFFFFFFFFFFFFFFF
+    h = _mix(h ^ np.uint64(seed_key))
+    angle = (h >> np.uint64(11)).astype(np.float64) * (2 * np.pi / 2.0**53)
+    return np.cos(angle), np.sin(angle)
+
+
+def _fade(t):
+    return t * t * t * (t * (t * 6 - 15) + 10)
+
+
+def gradient_noise(x, y, octaves, seed):
+    """Noise value for every (x, y) pair, roughly in [-0.7, 0.7]."""
+    x = np.asarray(x, dtype=np.float64) * octaves
+    y = np.asarray(y, dtype=np.float64) * octaves
+    x0, y0 = np.floor(x), np.floor(y)
+    fx, fy = x - x0, y - y0
+    ix, iy = x0.astype(np.int64), y0.astype(np.int64)
+
+    total = np.zeros(np.broadcast(x, y).shape)
+    for cy in (0, 1):
+        for cx in (0, 1):
+            gx, gy = _gradients(ix + cx, iy + cy, seed)
+            dx, dy = fx - cx, fy - cy
+            total += _fade(1 - np.abs(dx)) * _fade(1 - np.abs(dy)) * (gx * dx + gy * dy)
+    return total
+
+
+def island_fields(w, h, seed):
+    """Elevation and temperature grids for a w x h island (what World._gen_island used per tile)."""
+    nx = np.arange(w) / w - 0.5
+    ny = (np.arange(h) / h - 0.5)[:, None]
+    dist = np.sqrt(nx * nx + ny * ny) / ISLAND_RADIUS
+    height = gradient_noise(nx * ELEV_SCALE, ny * ELEV_SCALE, ELEV_OCTAVES, seed) - dist * ISLAND_FALLOFF
+    temp = TEMP_BASE + gradient_noise(nx * TEMP_SCALE, ny * TEMP_SCALE, TEMP_OCTAVES, seed + 1) * TEMP_RANGE
+    return height, temp
+
+
+def open_fields(x0, y0, w, h, seed):
+    """
+    Elevation and temperature for tiles [y0:y0+h, x0:x0+w] of the endless world.
+    No island falloff: a low-frequency continent layer decides where land is.
+    Noise units are OPEN_WORLD_SCALE tiles, so one unit looks like one old island.
+    """
+    nx = (x0 + np.arange(w)) / OPEN_WORLD_SCALE
+    ny = ((y0 + np.arange(h)) / OPEN_WORLD_SCALE)[:, None]
+    continent = gradient_noise(nx * CONTINENT_SCALE, ny * CONTINENT_SCALE, 1, seed + 2)
+    height = gradient_noise(nx * ELEV_SCALE, ny * ELEV_SCALE, ELEV_OCTAVES, seed) + continent * 1.2 + 0.25
+    temp = TEMP_BASE + gradient_noise(nx * TEMP_SCALE, ny * TEMP_SCALE, TEMP_OCTAVES, seed + 1) * TEMP_RANGE
+    return height, temp
+
+
+def resolve_seed(seed):
+    """Explicit seed > config.WORLD_SEED > fresh random seed. Returns (seed, cacheable)."""
+    if seed is None:
+        seed = config.WORLD_SEED
+    if seed is None:
+        return random.randint(0, 99999), False  # one-off island, not worth caching
+    return seed, config.USE_WORLD_CACHE
+
+
+def cache_path(w, h, seed):
+    key = (GENERATOR_VERSION, seed, w, h, ELEV_OCTAVES, TEMP_OCTAVES, ELEV_SCALE, TEMP_SCALE,
+           ISLAND_RADIUS, ISLAND_FALLOFF, TEMP_BASE, TEMP_RANGE)
+    digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:12]
+    return CACHE_DIR / f"island_{w}x{h}_seed{seed}_{digest}.npz"
+
+
+def load_island_fields(w, h, seed, use_cache=True):
+    """island_fields() through the on-disk .npz cache."""
+    path = cache_path(w, h, seed)
+    if use_cache and path.exists():
+        try:
+            with np.load(path) as data:
+                return data["height"], data["temp"]
+        except (OSError, KeyError, ValueError):
+            pass  # unreadable cache file: regenerate below
+
+    height, temp = island_fields(w, h, seed)
+    if use_cache:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # per-writer tmp name: batch runs generate the same island at the same time
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, height=height, temp=temp)
+        try:
+            os.replace(tmp, path)
+        except OSError:
+            tmp.unlink(missing_ok=True)  # another run's copy is in place (or locked): same data
+    return height, temp
@@ -5,11 +5,11 @@ from config import TILE_SIZE, TREE_THRESHOLD
 class Tile:
     """Represents a single terrain tile with water, earth, nature, and heat characteristics."""
 
-    __slots__ = ("x", "y", "rect", "water", "earth", "nature", "heat", "color", "is_obstacle")
+    __slots__ = ("x", "y", "water", "earth", "nature", "heat", "color", "is_obstacle", "world")
 
-    def __init__(self, x, y, height, temp):
+    def __init__(self, x, y, height, temp, world=None):
         self.x, self.y = x, y
-        self.rect = pygame.Rect(x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+        self.world = world  # notified on player edits (active-region scheduling, change feed)
 
         # base values
         self.water = max(0.0, min(1.0, 1.0 - (height + 0.25) * 1.2)) if height < 0.5 else 0.0
@@ -19,6 +19,11 @@ class Tile:
         self.is_obstacle = False
         self.update_visual()
 
+    @property
+    def rect(self):
+        """World-space rect, built on demand instead of stored per tile."""
+        return pygame.Rect(self.x * TILE_SIZE, self.y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+
     # -----------------------------
     # == Core Helpers
     # -----------------------------
@@ -35,12 +40,20 @@ class Tile:
         """Increase vegetation (simulate planting)."""
         self.nature = min(5.0, self.nature + amount)
         self.update_visual()
+        self._edited()
 
     def burn(self, amount=1.0):
         """Decrease vegetation and heat the tile (simulate burning)."""
         self.nature = max(0.0, self.nature - amount)
         self.heat += 10.0 * amount
         self.update_visual()
+        self._edited()
+
+    def _edited(self):
+        """Tell the world, like edit_tile_nature: wake the tile and log it in the change feed."""
+        if self.world is not None:
+            self.world.mark_active(self.x, self.y)
+            self.world.changes.record((self.x,), (self.y,))
 
     # -----------------------------
     # == Visual Representation
@@ -48,24 +61,159 @@ class Tile:
     def update_visual(self):
         """Choose color based on water, earth, nature, and heat levels."""
         self.is_obstacle = self.nature >= TREE_THRESHOLD
+        self.color = tile_color(self.water, self.nature, self.heat)
+
+
+# Every colour a tile can take, addressed by a small index (fits a uint8 grid).
+# 0 is reserved for "no tile" (outside the world / not loaded).
+VOID_INDEX, DEEP_WATER, SHALLOW_WATER, DENSE_FOREST, BUSH, TALL_GRASS, GRASS, BARE_GROUND = range(8)
+BARE_MIN, BARE_MAX = 80, 230  # bare ground brightness, ramped by heat
+PALETTE = [
+    (0, 0, 0),        # void
+    (0, 0, 160),      # deep water
+    (20, 100, 200),   # shallow water
+    (0, 70, 0),       # dense forest
+    (10, 115, 10),    # bush
+    (60, 170, 60),    # tall grass
+    (105, 200, 105),  # grass
+] + [(base, base - 20, 80) for base in range(BARE_MIN, BARE_MAX + 1)]
+PALETTE_INDEX = {color: i for i, color in enumerate(PALETTE) if i != VOID_INDEX}
+
+
+def tile_color_index(water, nature, heat):
+    """PALETTE index for a tile; shared by Tile and TileView."""
+    # Water dominant
+    if water > 0.68:
+        return DEEP_WATER
+    if water > 0.38:
+        return SHALLOW_WATER
+
+    # Vegetation spectrum
+    if nature >= 4.5:
+        return DENSE_FOREST
+    if nature >= 3.5:
+        return BUSH
+    if nature >= 2.0:
+        return TALL_GRASS
+    if nature >= 1.0:
+        return GRASS
+
+    # Bare ground reacts to heat
+    base = int(170 + (heat - 300) * 0.35)
+    base = max(BARE_MIN, min(BARE_MAX, base))
+    return BARE_GROUND + base - BARE_MIN
+
+
+def tile_color(water, nature, heat):
+    return PALETTE[tile_color_index(water, nature, heat)]
+
+
+def edit_tile_nature(world, x, y, delta):
+    """Player edit: nudge a tile's vegetation by delta (kept in 0..5). Shared by every world type as edit_nature()."""
+    tile = world.tile_at(x, y)
+    if tile is None:
+        return
+    tile.nature = max(0.0, min(5.0, tile.nature + delta))
+    tile.update_visual()
+    world.mark_active(x, y)
+    world.changes.record((x,), (y,))
+
+
+VOID_COLOR = 0xFF000000  # color_block() value for tiles outside the world / not loaded
+
+
+def pack_color(color):
+    r, g, b = color
+    return (r << 16) | (g << 8) | b
+
+
+def unpack_color(packed):
+    packed = int(packed)
+    return ((packed >> 16) & 0xFF, (packed >> 8) & 0xFF, packed & 0xFF)
+
+
+class TileView:
+    """Tile facade over a NumpyWorld's arrays (same API as Tile, no per-tile state)."""
+
+    __slots__ = ("world", "x", "y")
+
+    def __init__(self, world, x, y):
+        self.world = world
+        self.x, self.y = x, y
+
+    def _field(name):
+        def get(self):
+            return float(getattr(self.world, name)[self.y, self.x])
+
+        def set(self, value):
+            self.world.write(name, self.x, self.y, value)
+
+        return property(get, set)
+
+    water = _field("water")
+    earth = _field("earth")
+    nature = _field("nature")
+    heat = _field("heat")
+    del _field
+
+    @property
+    def rect(self):
+        return pygame.Rect(self.x * TILE_SIZE, self.y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+
+    @property
+    def color(self):
+        return PALETTE[self.world.color_index[self.y, self.x]]
+
+    @property
+    def is_obstacle(self):
+        return self.world.is_obstacle(self.x, self.y)
+
+    fertile = Tile.fertile
+    harsh = Tile.harsh
+    grow = Tile.grow
+    burn = Tile.burn
+    _edited = Tile._edited
+
+    def update_visual(self):
+        """Recompute this tile's palette index in the world grid."""
+        self.world.color_index[self.y, self.x] = tile_color_index(self.water, self.nature, self.heat)
+
+
+class TileGrid:
+    """`world.tiles[y][x]` for array-backed worlds: TileViews are made on access, nothing is stored per tile."""
+
+    __slots__ = ("world",)
+
+    def __init__(self, world):
+        self.world = world
+
+    def __len__(self):
+        return self.world.h
+
+    def __getitem__(self, y):
+        if not 0 <= y < self.world.h:
+            raise IndexError(y)
+        return TileRow(self.world, y)
+
+    def __iter__(self):
+        for y in range(self.world.h):
+            yield TileRow(self.world, y)
+
+
+class TileRow:
+    __slots__ = ("world", "y")
+
+    def __init__(self, world, y):
+        self.world, self.y = world, y
+
+    def __len__(self):
+        return self.world.w
+
+    def __getitem__(self, x):
+        if not 0 <= x < self.world.w:
+            raise IndexError(x)
+        return TileView(self.world, x, self.y)
 
-        # Water dominant
-        if self.water > 0.68:
-            self.color = (0, 0, 160)  # deep water
-        elif self.water > 0.38:
-            self.color = (20, 100, 200)  # shallow water
-        else:
-            # Vegetation spectrum
-            if self.nature >= 4.5:
-                self.color = (0, 70, 0)      # dense forest
-            elif self.nature >= 3.5:
-                self.color = (10, 115, 10)   # bush
-            elif self.nature >= 2.0:
-                self.color = (60, 170, 60)   # tall grass
-            elif self.nature >= 1.0:
-                self.color = (105, 200, 105) # grass
-            else:
-                # Bare ground reacts to heat
-                base = int(170 + (self.heat - 300) * 0.35)
-                base = max(80, min(230, base))
-                self.color = (base, base - 20, 80)
+    def __iter__(self):
+        for x in range(self.world.w):
+            yield TileView(self.world, x, self.y)
@@ -0,0 +1,37 @@
+# -------------------- timestep.py --------------------
+
+# ==========================================================
+# == FIXED TIMESTEP
+# ==========================================================
+# Simulation runs in ticks of exactly 1/hz seconds, however long a render
+# frame takes: frame time goes into an accumulator and advance() says how
+# many whole ticks are due. At most max_ticks run per frame; time beyond
+# that is dropped instead of carried over, so one slow frame can't snowball
+# into ever longer catch-up frames (spiral of death).
+
+
+class FixedTimestep:
+    def __init__(self, hz, max_ticks=5):
+        self.step_ms = 1000.0 / hz
+        self.max_ticks = max_ticks
+        self.accumulator = 0.0
+        self.ticks = 0  # ticks run by the last advance()
+        self.dropped = 0  # ticks skipped by the catch-up cap, in total
+        self.total_ticks = 0
+
+    def advance(self, frame_ms):
+        """Add one frame's time; returns how many ticks to run now."""
+        self.accumulator += frame_ms
+        due = int(self.accumulator // self.step_ms)
+        self.ticks = min(due, self.max_ticks)
+        self.accumulator -= self.ticks * self.step_ms
+        if due > self.ticks:
+            self.dropped += due - self.ticks
+            self.accumulator %= self.step_ms  # forget the backlog, keep the partial tick
+        self.total_ticks += self.ticks
+        return self.ticks
+
+    @property
+    def alpha(self):
+        """How far render time is into the next tick, 0..1 (for interpolation)."""
+        return self.accumulator / self.step_ms
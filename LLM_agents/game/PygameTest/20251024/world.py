@@ -1,7 +1,10 @@
 import pygame, random, math, time
-from perlin_noise import PerlinNoise
-from config import TILE_SIZE, TREE_THRESHOLD, HEAT_DIFFUSE_RATE, WATER_DIFFUSE_RATE, WATER_COOLING, DECAY_RATE, REGROWTH_RATE, EVAP_PER_K
-from tiles import Tile
+import numpy as np
+from config import TILE_SIZE, TREE_THRESHOLD, HEAT_DIFFUSE_RATE, WATER_DIFFUSE_RATE, WATER_COOLING, DECAY_RATE, REGROWTH_RATE, EVAP_PER_K, ACTIVE_EPSILON, ACTIVE_HEAT_EPSILON
+from tiles import Tile, VOID_INDEX, PALETTE_INDEX, edit_tile_nature
+from terrain import load_island_fields, resolve_seed
+from world_np import PALETTE_PACKED
+from change_feed import ChangeFeed, read_changes
 import config
 
 # ==========================================================
@@ -9,64 +12,176 @@ import config
 # ==========================================================
 
 
+def create_world(w, h, backend=None, seed=None):
+    """Build the world for the configured simulation backend."""
+    backend = backend or config.SIM_BACKEND
+    if backend == "numpy":
+        from world_np import NumpyWorld
+        return NumpyWorld(w, h, seed=seed)
+    if backend == "parallel":
+        from world_parallel import ParallelWorld
+        return ParallelWorld(w, h, seed=seed)
+    if backend == "python":
+        return World(w, h, seed=seed)
+    if backend == "chunked":
+        from chunk_world import ChunkWorld
+        return ChunkWorld(seed=seed)  # endless: w, h are unused
+    raise ValueError(f"Unknown SIM_BACKEND: {backend!r}")
+
+
 class World:
-    def __init__(self, w, h):
+    step_limit = config.UPDATE_STEP_LIMIT  # simulate_step budget per frame/tick
+
+    def __init__(self, w, h, double_buffered=None, active_scheduling=None, seed=None):
         self.w, self.h = w, h
+        self.seed, self._cache_terrain = resolve_seed(seed)
+        self.rng = random.Random(self.seed)
         self.tiles = [[None]*w for _ in range(h)]
+        self.changes = ChangeFeed()  # tiles whose colour changed, for incremental redraws
         self._gen_island()
         self._seed_vegetation()
         self._update_index = 0
+        self.sweeps = 0  # completed full passes over the map
+
+        # double buffering: neighbours are read from the state frozen at sweep start
+        self.double_buffered = config.DOUBLE_BUFFERED if double_buffered is None else double_buffered
+        self._front_heat = None
+        self._front_water = None
+
+        # active-region scheduling: a sweep only visits tiles that changed last sweep (+ neighbours)
+        self.active_scheduling = config.ACTIVE_SCHEDULING if active_scheduling is None else active_scheduling
+        self._active = set(range(w * h))  # everything starts awake
+        self._frontier = range(w * h)
+        self.active_count = w * h
 
     def _gen_island(self):
-        elev_noise = PerlinNoise(octaves=4, seed=random.randint(0, 99999))
-        temp_noise = PerlinNoise(octaves=3, seed=random.randint(0, 99999))
+        height, temp = load_island_fields(self.w, self.h, self.seed, use_cache=self._cache_terrain)
+        height, temp = height.tolist(), temp.tolist()
         for y in range(self.h):
             for x in range(self.w):
-                nx, ny = x/self.w - 0.5, y/self.h - 0.5
-                dist = math.sqrt(nx*nx + ny*ny) / 0.72
-                height = elev_noise([nx*2.3, ny*2.3]) - dist*0.85
-                temp = 300 + temp_noise([nx*3.1, ny*3.1]) * 18
-                self.tiles[y][x] = Tile(x, y, height, temp)
+                self.tiles[y][x] = Tile(x, y, height[y][x], temp[y][x], world=self)
 
     def _seed_vegetation(self):
+        rng = self.rng
         for row in self.tiles:
             for t in row:
                 if t.water < 0.3 and t.earth > 0.4:
-                    t.nature = random.uniform(0.0, 2.2)
-                if t.fertile() and random.random() < 0.10:
-                    t.nature = max(t.nature, random.uniform(1.0, 3.5))
-                if t.fertile() and random.random() < 0.03:
-                    t.nature = max(t.nature, random.uniform(4.0, 5.0))
+                    t.nature = rng.uniform(0.0, 2.2)
+                if t.fertile() and rng.random() < 0.10:
+                    t.nature = max(t.nature, rng.uniform(1.0, 3.5))
+                if t.fertile() and rng.random() < 0.03:
+                    t.nature = max(t.nature, rng.uniform(4.0, 5.0))
                 t.update_visual()
 
     def simulate_step(self, budget):
-        total_tiles = self.w * self.h
+        if self._update_index == 0:
+            self._begin_sweep()
+        frontier = self._frontier
         steps = 0
-        while steps < budget and self._update_index < total_tiles:
-            y, x = divmod(self._update_index, self.w)
-            self._update_tile(x, y)
+        changed = []
+        while steps < budget and self._update_index < len(frontier):
+            y, x = divmod(frontier[self._update_index], self.w)
+            if self._update_tile(x, y):
+                changed.append(frontier[self._update_index])
             self._update_index += 1
             steps += 1
-        if self._update_index >= total_tiles:
+        if changed:
+            ys, xs = np.divmod(changed, self.w)
+            self.changes.record(xs, ys)
+        if self._update_index >= len(frontier):
             self._update_index = 0
+            self.sweeps += 1
+
+    # -----------------------------
+    # == Tile access (shared by all world types)
+    # -----------------------------
+    @property
+    def bounds(self):
+        """(x0, y0, x1, y1) in tiles."""
+        return (0, 0, self.w, self.h)
+
+    def tile_at(self, x, y):
+        """Tile at (x, y), or None outside the map."""
+        if 0 <= x < self.w and 0 <= y < self.h:
+            return self.tiles[y][x]
+        return None
 
+    def index_block(self, x0, y0, x1, y1):
+        """PALETTE indices of tiles [y0:y1, x0:x1]; VOID_INDEX outside the map."""
+        out = np.full((y1 - y0, x1 - x0), VOID_INDEX, dtype=np.uint8)
+        cx0, cy0 = max(x0, 0), max(y0, 0)
+        cx1, cy1 = min(x1, self.w), min(y1, self.h)
+        if cx0 < cx1 and cy0 < cy1:
+            out[cy0 - y0:cy1 - y0, cx0 - x0:cx1 - x0] = [
+                [PALETTE_INDEX[t.color] for t in row[cx0:cx1]] for row in self.tiles[cy0:cy1]
+            ]
+        return out
 
+    def color_block(self, x0, y0, x1, y1):
+        """Packed colours of tiles [y0:y1, x0:x1]; VOID_COLOR outside the map."""
+        return PALETTE_PACKED[self.index_block(x0, y0, x1, y1)]
 
+    def obstacle_block(self, x0, y0, x1, y1):
+        """Boolean grid of blocking tiles in [y0:y1, x0:x1]; False outside the map."""
+        out = np.zeros((y1 - y0, x1 - x0), dtype=bool)
+        cx0, cy0 = max(x0, 0), max(y0, 0)
+        cx1, cy1 = min(x1, self.w), min(y1, self.h)
+        if cx0 < cx1 and cy0 < cy1:
+            out[cy0 - y0:cy1 - y0, cx0 - x0:cx1 - x0] = [
+                [t.is_obstacle for t in row[cx0:cx1]] for row in self.tiles[cy0:cy1]
+            ]
+        return out
 
+    def is_obstacle(self, x, y):
+        tile = self.tile_at(x, y)
+        return tile is not None and tile.is_obstacle
+
+    edit_nature = edit_tile_nature
+    changes_since = read_changes
+
+    def _begin_sweep(self):
+        if self.double_buffered:
+            self._swap_buffers()
+        if self.active_scheduling:
+            self._frontier = sorted(self._active)
+            self._active = set()
+        else:
+            self._frontier = range(self.w * self.h)
+        self.active_count = len(self._frontier)
+
+    def _swap_buffers(self):
+        """Freeze the finished sweep as the read buffer for the next one."""
+        self._front_heat = [[t.heat for t in row] for row in self.tiles]
+        self._front_water = [[t.water for t in row] for row in self.tiles]
+
+    def mark_active(self, x, y):
+        """Wake a tile and its neighbours for the next sweep (call after editing a tile)."""
+        if not self.active_scheduling:
+            return
+        for ny in range(max(0, y - 1), min(self.h, y + 2)):
+            for nx in range(max(0, x - 1), min(self.w, x + 2)):
+                self._active.add(ny * self.w + nx)
 
     def _update_tile(self, x, y):
+        """Step one tile. Returns True if its colour changed."""
         t = self.tiles[y][x]
-        neigh = []
+        coords = []
         for dy in (-1, 0, 1):
             for dx in (-1, 0, 1):
                 if dx == 0 and dy == 0: continue
                 nx, ny = x + dx, y + dy
                 if 0 <= nx < self.w and 0 <= ny < self.h:
-                    neigh.append(self.tiles[ny][nx])
-        if not neigh: return
+                    coords.append((nx, ny))
+        if not coords: return
+
+        if self.double_buffered:
+            avg_heat = sum(self._front_heat[ny][nx] for nx, ny in coords)/len(coords)
+            avg_water = sum(self._front_water[ny][nx] for nx, ny in coords)/len(coords)
+        else:
+            avg_heat = sum(self.tiles[ny][nx].heat for nx, ny in coords)/len(coords)
+            avg_water = sum(self.tiles[ny][nx].water for nx, ny in coords)/len(coords)
 
-        avg_heat = sum(nb.heat for nb in neigh)/len(neigh)
-        avg_water = sum(nb.water for nb in neigh)/len(neigh)
+        old_heat, old_water, old_nature, old_color = t.heat, t.water, t.nature, t.color
 
         t.heat += (avg_heat - t.heat) * HEAT_DIFFUSE_RATE - WATER_COOLING * avg_water
         t.water += (avg_water - t.water) * WATER_DIFFUSE_RATE - max(0.0, (t.heat - 300) * EVAP_PER_K)
@@ -80,4 +195,10 @@ class World:
         if t.heat > 335 and t.nature >= 3.0:
             t.nature = max(0.0, t.nature - 0.05)
 
-        t.update_visual()
\ No newline at end of file
+        t.update_visual()
+
+        if (abs(t.heat - old_heat) > ACTIVE_HEAT_EPSILON
+                or abs(t.water - old_water) > ACTIVE_EPSILON
+                or abs(t.nature - old_nature) > ACTIVE_EPSILON):
+            self.mark_active(x, y)
+        return t.color != old_color
@@ -0,0 +1,336 @@
+# -------------------- world_np.py --------------------
+import numpy as np
+from config import TREE_THRESHOLD, HEAT_DIFFUSE_RATE, WATER_DIFFUSE_RATE, WATER_COOLING, DECAY_RATE, REGROWTH_RATE, EVAP_PER_K, ACTIVE_SCHEDULING, ACTIVE_EPSILON, ACTIVE_HEAT_EPSILON, NUMPY_UPDATE_STEP_LIMIT
+from tiles import TileGrid, edit_tile_nature, VOID_COLOR, VOID_INDEX, PALETTE, pack_color, DEEP_WATER, SHALLOW_WATER, DENSE_FOREST, BUSH, TALL_GRASS, GRASS, BARE_GROUND, BARE_MIN, BARE_MAX
+from terrain import load_island_fields, resolve_seed
+from change_feed import ChangeFeed, read_changes
+
+# ==========================================================
+# == NUMPY WORLD
+# ==========================================================
+# Same ecology as World._update_tile, but every field is a 2D array
+# and one simulate_step() updates the whole grid.
+
+# PALETTE as packed 0xRRGGBB, indexable by a whole colour-index grid
+PALETTE_PACKED = np.array([VOID_COLOR] + [pack_color(c) for c in PALETTE[1:]], dtype=np.uint32)
+
+
+FIELDS = ("heat", "water", "earth", "nature")
+
+
+def ring_sum(p):
+    """Sum of the 8 neighbours of every interior cell of `p` (result is 2 smaller per axis)."""
+    return (p[:-2, :-2] + p[:-2, 1:-1] + p[:-2, 2:]
+            + p[1:-1, :-2] + p[1:-1, 2:]
+            + p[2:, :-2] + p[2:, 1:-1] + p[2:, 2:])
+
+
+def neighbour_sum(a):
+    """Sum of the 8 neighbours of every cell (cells outside the grid count as 0)."""
+    return ring_sum(np.pad(a, 1))
+
+
+def with_halo(a, y0, y1, x0, x1):
+    """Region [y0:y1, x0:x1] of `a` plus a one-tile halo, zero-padded at the map border."""
+    h, w = a.shape
+    block = a[max(y0 - 1, 0):min(y1 + 1, h), max(x0 - 1, 0):min(x1 + 1, w)]
+    return np.pad(block, ((int(y0 == 0), int(y1 == h)), (int(x0 == 0), int(x1 == w))))
+
+
+def step_region(src, dst, neigh_count, y0, y1, x0, x1, track_changes=False):
+    """
+    Advance tiles [y0:y1, x0:x1] one step.
+    Reads only `src` (dict of full-grid arrays, halo included) and writes only `dst`,
+    so disjoint regions can be stepped in any order or in parallel.
+    If dst has an "obstacle_bits" bitset, the region's bits are packed into it too
+    (x0 must then be a multiple of 8, and x1 too unless it is the map's right edge).
+    With track_changes (dst["color_index"] must hold the current colours), returns
+    (ys, xs) of the tiles whose colour index changed, in grid coordinates.
+    """
+    region = (slice(y0, y1), slice(x0, x1))
+    count = neigh_count[region]
+    avg_heat = ring_sum(with_halo(src["heat"], y0, y1, x0, x1)) / count
+    avg_water = ring_sum(with_halo(src["water"], y0, y1, x0, x1)) / count
+
+    heat = src["heat"][region] + ((avg_heat - src["heat"][region]) * HEAT_DIFFUSE_RATE - WATER_COOLING * avg_water)
+    water = src["water"][region] + ((avg_water - src["water"][region]) * WATER_DIFFUSE_RATE - np.maximum(0.0, (heat - 300) * EVAP_PER_K))
+    np.clip(water, 0.0, 1.0, out=water)
+    earth = 1.0 - water
+
+    n = src["nature"][region].copy()
+    n[fertile_mask(water, earth, heat)] += REGROWTH_RATE
+    np.minimum(n, 5.0, out=n)
+    n[harsh_mask(water, earth, heat)] -= DECAY_RATE
+    n[(heat > 335) & (n >= 3.0)] -= 0.05
+    np.maximum(n, 0.0, out=n)
+
+    dst["heat"][region] = heat
+    dst["water"][region] = water
+    dst["earth"][region] = earth
+    dst["nature"][region] = n
+    colors = index_grid(water, n, heat)
+    if track_changes:
+        ys, xs = np.nonzero(colors != dst["color_index"][region])
+    dst["color_index"][region] = colors
+    bits = dst.get("obstacle_bits")
+    if bits is not None:
+        bits[y0:y1, x0 >> 3:(x1 + 7) >> 3] = np.packbits(n >= TREE_THRESHOLD, axis=1)
+    if track_changes:
+        return ys + y0, xs + x0
+
+
+def apply_terrain(fields, height, temp):
+    """Initial water/earth/heat from elevation and temperature (same rules as Tile.__init__)."""
+    water = np.where(height < 0.5, np.clip(1.0 - (height + 0.25) * 1.2, 0.0, 1.0), 0.0)
+    fields["water"][:] = water
+    fields["earth"][:] = np.clip(1.0 - water, 0.0, 1.0)
+    fields["heat"][:] = temp
+
+
+def seed_vegetation(fields, rng):
+    """Random starting vegetation (same rules as World._seed_vegetation)."""
+    water, earth, nature = fields["water"], fields["earth"], fields["nature"]
+    shape = nature.shape
+    fertile = fertile_mask(water, earth, fields["heat"])
+
+    dry = (water < 0.3) & (earth > 0.4)
+    nature[dry] = rng.uniform(0.0, 2.2, shape)[dry]
+    grass = fertile & (rng.random(shape) < 0.10)
+    nature[grass] = np.maximum(nature, rng.uniform(1.0, 3.5, shape))[grass]
+    forest = fertile & (rng.random(shape) < 0.03)
+    nature[forest] = np.maximum(nature, rng.uniform(4.0, 5.0, shape))[forest]
+
+
+def row_runs(mask):
+    """(start, stop) of every run of True in a 1D bool array."""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.astype(np.int8), [0]))))
+    return list(zip(edges[::2].tolist(), edges[1::2].tolist()))
+
+
+def fertile_mask(water, earth, heat):
+    return (0.22 <= water) & (water <= 0.65) & (285 <= heat) & (heat <= 315) & (earth > 0.3)
+
+
+def harsh_mask(water, earth, heat):
+    return (water < 0.12) | (heat >= 330) | (earth < 0.2)
+
+
+def index_grid(water, nature, heat):
+    """Vectorized tiles.tile_color_index, returns uint8 PALETTE indices."""
+    bare = np.clip(np.trunc(170 + (heat - 300) * 0.35), BARE_MIN, BARE_MAX).astype(np.int64) + (BARE_GROUND - BARE_MIN)
+    return np.select(
+        [water > 0.68, water > 0.38, nature >= 4.5, nature >= 3.5, nature >= 2.0, nature >= 1.0],
+        [DEEP_WATER, SHALLOW_WATER, DENSE_FOREST, BUSH, TALL_GRASS, GRASS],
+        bare,
+    ).astype(np.uint8)
+
+
+def clip_block(grid, x0, y0, x1, y1, fill):
+    """grid[y0:y1, x0:x1] with out-of-range tiles set to fill (a view when fully inside)."""
+    h, w = grid.shape
+    if x0 >= 0 and y0 >= 0 and x1 <= w and y1 <= h:
+        return grid[y0:y1, x0:x1]
+    out = np.full((y1 - y0, x1 - x0), fill, dtype=grid.dtype)
+    cx0, cy0 = max(x0, 0), max(y0, 0)
+    cx1, cy1 = min(x1, w), min(y1, h)
+    if cx0 < cx1 and cy0 < cy1:
+        out[cy0 - y0:cy1 - y0, cx0 - x0:cx1 - x0] = grid[cy0:cy1, cx0:cx1]
+    return out
+
+
+class NumpyWorld:
+    """
+    Double-buffered: a sweep reads the front buffers and writes the back ones,
+    then the two are swapped, so the result never depends on how a sweep is split up.
+    """
+
+    step_limit = NUMPY_UPDATE_STEP_LIMIT  # simulate_step budget per frame/tick
+
+    def __init__(self, w, h, generate=True, active_scheduling=None, seed=None):
+        self.w, self.h = w, h
+        self.seed, self._cache_terrain = resolve_seed(seed)
+        # struct-of-arrays store: float32 fields, uint8 PALETTE index, obstacle bitset
+        for name in FIELDS:
+            setattr(self, name, self._alloc(np.float32))
+        self.color_index = self._alloc(np.uint8)
+        self.changes = ChangeFeed()  # tiles whose colour index changed, for incremental redraws
+        self._back = {name: self._alloc(np.float32) for name in FIELDS}
+        self._back["color_index"] = self.color_index  # colour is written in place as rows finish
+        self._neigh_count = self._alloc(np.uint8)
+        self._neigh_count[:] = neighbour_sum(np.ones((h, w), dtype=np.uint8))
+        # obstacle bitset, double-buffered like the fields: step_region packs the rows it steps into the back one
+        self.obstacle_bits = self._alloc(np.uint8, (h, (w + 7) // 8))
+        self._back["obstacle_bits"] = self._alloc(np.uint8, (h, (w + 7) // 8))
+        self._update_row = 0
+        self.sweeps = 0
+
+        # active-region scheduling: only rows holding awake tiles are stepped, the rest is copied
+        self.active_scheduling = ACTIVE_SCHEDULING if active_scheduling is None else active_scheduling
+        self._active = np.zeros((h, w), dtype=bool)
+        self._next_active = np.ones((h, w), dtype=bool)  # everything starts awake
+        self._sweep_rows = np.ones(h, dtype=bool)
+        self.active_count = w * h
+
+        if generate:
+            self._gen_island()
+            self._seed_vegetation()
+        self.tiles = TileGrid(self)
+
+    def _alloc(self, dtype, shape=None):
+        """Zeroed grid, (h, w) by default. Subclasses override this to place grids elsewhere (e.g. shared memory)."""
+        return np.zeros((self.h, self.w) if shape is None else shape, dtype=dtype)
+
+    def _gen_island(self):
+        height, temp = load_island_fields(self.w, self.h, self.seed, use_cache=self._cache_terrain)
+        apply_terrain(self.front(), height, temp)
+
+    def _seed_vegetation(self):
+        seed_vegetation(self.front(), np.random.default_rng(self.seed))
+        self.update_visual()
+
+    # -----------------------------
+    # == Core Helpers
+    # -----------------------------
+    def front(self):
+        return {name: getattr(self, name) for name in FIELDS}
+
+    def write(self, name, x, y, value):
+        """Edit one tile field in both buffers so it survives the next swap."""
+        getattr(self, name)[y, x] = value
+        self._back[name][y, x] = value
+        if name == "nature":
+            bit = 0x80 >> (x & 7)
+            for bits in (self.obstacle_bits, self._back["obstacle_bits"]):
+                if value >= TREE_THRESHOLD:
+                    bits[y, x >> 3] |= bit
+                else:
+                    bits[y, x >> 3] &= ~bit & 0xFF
+
+    def update_visual(self):
+        self.color_index[:] = index_grid(self.water, self.nature, self.heat)
+        self._update_obstacles()
+        self.changes.reset()
+
+    @property
+    def bounds(self):
+        return (0, 0, self.w, self.h)
+
+    def tile_at(self, x, y):
+        if 0 <= x < self.w and 0 <= y < self.h:
+            return self.tiles[y][x]
+        return None
+
+    def index_block(self, x0, y0, x1, y1):
+        """PALETTE indices of tiles [y0:y1, x0:x1]; VOID_INDEX outside the map. May be a view."""
+        return clip_block(self.color_index, x0, y0, x1, y1, VOID_INDEX)
+
+    def color_block(self, x0, y0, x1, y1):
+        """Packed colours of tiles [y0:y1, x0:x1]; VOID_COLOR outside the map."""
+        return PALETTE_PACKED[self.index_block(x0, y0, x1, y1)]
+
+    def _update_obstacles(self):
+        """Repack the whole obstacle bitset (both buffers); only after bulk edits, sweeps keep it current."""
+        self.obstacle_bits[:] = np.packbits(self.nature >= TREE_THRESHOLD, axis=1)
+        self._back["obstacle_bits"][:] = self.obstacle_bits
+
+    @property
+    def obstacles(self):
+        """Boolean grid of tiles that block movement."""
+        return np.unpackbits(self.obstacle_bits, axis=1, count=self.w).astype(bool)
+
+    def is_obstacle(self, x, y):
+        if not (0 <= x < self.w and 0 <= y < self.h):
+            return False
+        return bool((self.obstacle_bits[y, x >> 3] >> (7 - (x & 7))) & 1)
+
+    def obstacle_block(self, x0, y0, x1, y1):
+        """Boolean grid of blocking tiles in [y0:y1, x0:x1]; False outside the map."""
+        return clip_block(self.obstacles, x0, y0, x1, y1, False)
+
+    edit_nature = edit_tile_nature
+    changes_since = read_changes
+
+    @property
+    def nbytes(self):
+        """Bytes held by the per-tile grids (both buffers, colour, bitsets and masks)."""
+        grids = [getattr(self, name) for name in FIELDS] + [self._back[name] for name in FIELDS]
+        grids += [self.color_index, self._neigh_count, self.obstacle_bits, self._back["obstacle_bits"],
+                  self._active, self._next_active]
+        return sum(a.nbytes for a in grids)
+
+    # -----------------------------
+    # == Simulation
+    # -----------------------------
+    def simulate_step(self, budget=None):
+        """
+        Advance up to `budget` tiles (rounded up to whole rows) of the current sweep.
+        budget=None finishes the sweep in one call.
+        """
+        rows = self.h if budget is None else max(1, -(-budget // self.w))
+        y0 = self._update_row
+        if y0 == 0:
+            self._begin_sweep()
+        y1 = min(self.h, y0 + rows)
+        src = self.front()
+
+        if not self.active_scheduling:
+            ys, xs = step_region(src, self._back, self._neigh_count, y0, y1, 0, self.w, track_changes=True)
+            self.changes.record(xs, ys)
+        else:
+            busy = self._sweep_rows[y0:y1]
+            for a, b in row_runs(busy):
+                ys, xs = step_region(src, self._back, self._neigh_count, y0 + a, y0 + b, 0, self.w, track_changes=True)
+                self.changes.record(xs, ys)
+                self._wake_changed(src, y0 + a, y0 + b)
+            for a, b in row_runs(~busy):
+                for name in FIELDS:
+                    self._back[name][y0 + a:y0 + b] = src[name][y0 + a:y0 + b]
+                self._back["obstacle_bits"][y0 + a:y0 + b] = self.obstacle_bits[y0 + a:y0 + b]
+
+        self._update_row = y1
+        if y1 >= self.h:
+            self._swap_buffers()
+
+    def _begin_sweep(self):
+        if not self.active_scheduling:
+            self.active_count = self.w * self.h
+            return
+        self._active, self._next_active = self._next_active, self._active
+        self._next_active[:] = False
+        self._sweep_rows = self._active.any(axis=1)
+        self.active_count = int(np.count_nonzero(self._active))
+
+    def _swap_buffers(self):
+        for name in FIELDS:
+            front = getattr(self, name)
+            setattr(self, name, self._back[name])
+            self._back[name] = front
+        self.obstacle_bits, self._back["obstacle_bits"] = self._back["obstacle_bits"], self.obstacle_bits
+        self._update_row = 0
+        self.sweeps += 1
+
+    def _wake_changed(self, src, a, b):
+        """Mark tiles of rows [a:b] that moved more than epsilon, plus their neighbours, for the next sweep."""
+        rows = slice(a, b)
+        changed = np.abs(self._back["heat"][rows] - src["heat"][rows]) > ACTIVE_HEAT_EPSILON
+        for name in ("water", "nature"):
+            changed |= np.abs(self._back[name][rows] - src[name][rows]) > ACTIVE_EPSILON
+
+        # grow by one tile in every direction; covers rows a-1 .. b
+        n = b - a
+        q = np.pad(changed, ((2, 2), (1, 1)))
+        grown = np.zeros((n + 2, self.w), dtype=bool)
+        for dy in range(3):
+            for dx in range(3):
+                grown |= q[dy:dy + n + 2, dx:dx + self.w]
+        lo, hi = a - 1, b + 1
+        if lo < 0:
+            grown, lo = grown[1:], 0
+        if hi > self.h:
+            grown, hi = grown[:-1], self.h
+        self._next_active[lo:hi] |= grown
+
+    def mark_active(self, x, y):
+        """Wake a tile and its neighbours for the next sweep (call after editing a tile)."""
+        if self.active_scheduling:
+            self._next_active[max(0, y - 1):y + 2, max(0, x - 1):x + 2] = True
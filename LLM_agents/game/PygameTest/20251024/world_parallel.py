@@ -0,0 +1,185 @@
+# -------------------- world_parallel.py --------------------
+import atexit, os, threading
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+from config import SIM_CHUNK_SIZE, SIM_WORKERS
+from world_np import NumpyWorld, FIELDS, step_region
+
+# ==========================================================
+# == PARALLEL WORLD
+# ==========================================================
+# NumpyWorld whose grids live in multiprocessing.shared_memory.
+# The map is cut into SIM_CHUNK_SIZE x SIM_CHUNK_SIZE chunks that are
+# stepped by a fixed set of worker processes. A chunk reads its one-tile
+# halo straight out of the shared front buffer, and the barrier at the end
+# of every step is the halo exchange: nothing is pickled per step.
+# Each worker also writes the tiles whose colour changed in its chunks to its
+# own row of a shared change list (flat y * w + x); a chunk whose changes no
+# longer fit is flagged dirty instead, and the main thread records it whole.
+#
+# Uses the "fork" start method where available. On spawn-only platforms the
+# script creating a ParallelWorld must guard its entry point with
+# `if __name__ == "__main__":`.
+
+
+def chunk_regions(w, h, size):
+    """(y0, y1, x0, x1) for every chunk, row-major."""
+    return [(y, min(y + size, h), x, min(x + size, w))
+            for y in range(0, h, size) for x in range(0, w, size)]
+
+
+def _attach(specs):
+    """Map shared-memory blocks back to numpy arrays. Returns (arrays, blocks)."""
+    arrays, blocks = {}, []
+    for key, (shm_name, shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        blocks.append(shm)
+        arrays[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    return arrays, blocks
+
+
+def _worker_main(specs, index, chunks, start, done, parity, stop):
+    """Step `chunks` ((chunk id, region) pairs) every time the start barrier opens."""
+    arrays, blocks = _attach(specs)
+    buffers = [
+        {name: arrays[f"a.{name}"] for name in FIELDS},
+        {name: arrays[f"b.{name}"] for name in FIELDS},
+    ]
+    for buf, side in zip(buffers, "ab"):
+        buf["color_index"] = arrays["color_index"]
+        buf["obstacle_bits"] = arrays[f"{side}.obstacle_bits"]  # workers pack their chunks' bits
+    count = arrays["count"]
+    changes = arrays["changes"][index]
+    change_count, dirty = arrays["change_count"], arrays["dirty"]
+    w = count.shape[1]
+
+    try:
+        while True:
+            start.wait()
+            if stop.value:
+                break
+            src, dst = buffers[parity.value], buffers[1 - parity.value]
+            n = 0
+            for cid, (y0, y1, x0, x1) in chunks:
+                ys, xs = step_region(src, dst, count, y0, y1, x0, x1, track_changes=True)
+                fits = n + len(ys) <= len(changes)
+                if fits:
+                    changes[n:n + len(ys)] = ys * w + xs
+                    n += len(ys)
+                dirty[cid] = not fits
+            change_count[index] = n
+            done.wait()
+    finally:
+        del arrays, buffers, count, changes, change_count, dirty
+        for shm in blocks:
+            shm.close()
+
+
+class ParallelWorld(NumpyWorld):
+    def __init__(self, w, h, workers=None, chunk_size=SIM_CHUNK_SIZE, generate=True, seed=None):
+        if chunk_size % 8:
+            raise ValueError(f"chunk_size must be a multiple of 8 (whole obstacle-bitset bytes), got {chunk_size}")
+        self._blocks = []
+        self._block_of = {}  # id(array) -> SharedMemory
+        self._specs = {}
+        self._procs = []
+        super().__init__(w, h, generate=generate, active_scheduling=False, seed=seed)  # workers always step every chunk
+
+        # name every grid so workers can find it: a.* is the front buffer at parity 0
+        for name in FIELDS:
+            self._register(f"a.{name}", getattr(self, name))
+            self._register(f"b.{name}", self._back[name])
+        self._register("a.obstacle_bits", self.obstacle_bits)
+        self._register("b.obstacle_bits", self._back["obstacle_bits"])
+        self._register("color_index", self.color_index)
+        self._register("count", self._neigh_count)
+
+        workers = workers or SIM_WORKERS or os.cpu_count() or 1
+        regions = chunk_regions(w, h, chunk_size)
+        self.workers = min(workers, len(regions))
+        self.chunk_count = len(regions)
+        self._regions = regions
+        chunks = [list(enumerate(regions))[i::self.workers] for i in range(self.workers)]
+
+        # per-worker change lists sized for 1/8 of the worker's tiles changing colour
+        cap = max(sum((y1 - y0) * (x1 - x0) for _, (y0, y1, x0, x1) in c) for c in chunks) // 8 + 1
+        self._changes = self._alloc(np.int32, (self.workers, cap))
+        self._change_count = self._alloc(np.int32, (self.workers,))
+        self._dirty = self._alloc(np.uint8, (self.chunk_count,))
+        self._register("changes", self._changes)
+        self._register("change_count", self._change_count)
+        self._register("dirty", self._dirty)
+
+        ctx = mp.get_context("fork" if "fork" in mp.get_all_start_methods() else "spawn")
+        self._start = ctx.Barrier(self.workers + 1)
+        self._done = ctx.Barrier(self.workers + 1)
+        self._parity = ctx.Value("i", 0, lock=False)
+        self._stop = ctx.Value("b", 0, lock=False)
+        for i in range(self.workers):
+            p = ctx.Process(
+                target=_worker_main,
+                args=(self._specs, i, chunks[i], self._start, self._done, self._parity, self._stop),
+                daemon=True,
+            )
+            p.start()
+            self._procs.append(p)
+        atexit.register(self.close)
+
+    def _alloc(self, dtype, shape=None):
+        dtype = np.dtype(dtype)
+        shape = (self.h, self.w) if shape is None else shape
+        shm = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * dtype.itemsize))
+        self._blocks.append(shm)
+        a = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        a.fill(0)
+        self._block_of[id(a)] = shm
+        return a
+
+    def _register(self, key, array):
+        shm = self._block_of[id(array)]
+        self._specs[key] = (shm.name, array.shape, array.dtype.str)
+
+    # -----------------------------
+    # == Simulation
+    # -----------------------------
+    def simulate_step(self, budget=None):
+        """One full sweep on the worker pool. The caller waits on the two barriers and merges the change lists."""
+        self._start.wait()
+        self._done.wait()
+        lists = [self._changes[i, :n] for i, n in enumerate(self._change_count) if n]
+        if lists:
+            ys, xs = np.divmod(np.concatenate(lists), self.w)
+            self.changes.record(xs, ys)
+        for cid in np.flatnonzero(self._dirty):
+            y0, y1, x0, x1 = self._regions[cid]
+            self.changes.record_rect(x0, y0, x1, y1)
+        self._swap_buffers()
+        self._parity.value = 1 - self._parity.value
+
+    def close(self):
+        """Stop the workers and release the shared memory."""
+        if self._procs:
+            self._stop.value = 1
+            try:
+                self._start.wait(timeout=5)
+            except threading.BrokenBarrierError:
+                pass
+            for p in self._procs:
+                p.join(timeout=5)
+                if p.is_alive():
+                    p.terminate()
+            self._procs = []
+        for name in FIELDS:
+            setattr(self, name, None)
+        self._back = {}
+        self.color_index = self._neigh_count = self.obstacle_bits = None
+        self._changes = self._change_count = self._dirty = None
+        for shm in self._blocks:
+            try:
+                shm.unlink()
+                shm.close()
+            except (BufferError, FileNotFoundError):
+                pass  # still referenced elsewhere; the mapping goes away with the process
+        self._blocks = []
+        self._block_of = {}
@@ -0,0 +1,132 @@
+# -------------------- bench_worldmap_layers.py --------------------
+# plant / cut / heat, collision and draw culling on a map with 100k trees:
+# the tile-keyed TileLayer storage of 20251019_worldinteraction.py against
+# the flat rect lists it replaced.
+#
+#   python bench_worldmap_layers.py
+#   python bench_worldmap_layers.py --trees 100000 --ops 2000
+import argparse, contextlib, importlib.util, io, os, random, time
+
+import pygame
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+spec = importlib.util.spec_from_file_location("worldinteraction", os.path.join(HERE, "20251019_worldinteraction.py"))
+game = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(game)
+TILE_SIZE = game.TILE_SIZE
+
+
+class FakePlayer:
+    def __init__(self):
+        self.rect = pygame.Rect(0, 0, 20, 20)
+
+    def stand_on(self, key):
+        self.rect.center = (key[0]*TILE_SIZE + TILE_SIZE//2, key[1]*TILE_SIZE + TILE_SIZE//2)
+
+
+# ==========================================================
+# == BASELINE (the old list layers)
+# ==========================================================
+def list_interact(player, layers, action):
+    px, py = int(player.rect.centerx//TILE_SIZE), int(player.rect.centery//TILE_SIZE)
+    rect = pygame.Rect(px*TILE_SIZE, py*TILE_SIZE, TILE_SIZE, TILE_SIZE)
+    if action == "plant":
+        if rect not in layers['trees']:
+            layers['trees'].append(rect)
+            layers['obstacles'].append(rect)
+    elif action == "cut":
+        for tree in layers['trees']:
+            if tree.collidepoint(player.rect.center):
+                layers['trees'].remove(tree)
+                if tree in layers['obstacles']:
+                    layers['obstacles'].remove(tree)
+                break
+    elif action == "heat":
+        key = (px, py)
+        if key in layers['temperature']:
+            layers['temperature'][key] += 5
+            if layers['temperature'][key] > 330:
+                layers['trees'] = [t for t in layers['trees'] if not t.collidepoint(player.rect.center)]
+                layers['obstacles'] = [o for o in layers['obstacles'] if not o.collidepoint(player.rect.center)]
+
+
+def build(keys, tile_layers):
+    if tile_layers:
+        layers = {"trees": game.TileLayer(), "obstacles": game.TileLayer(), "temperature": {}}
+        for key in keys:
+            game.add_tree(layers, key)
+    else:
+        layers = {"trees": [], "obstacles": [], "temperature": {}}
+        for x, y in keys:
+            r = pygame.Rect(x*TILE_SIZE, y*TILE_SIZE, TILE_SIZE, TILE_SIZE)
+            layers['trees'].append(r)
+            layers['obstacles'].append(r.copy())
+    for key in keys:
+        layers['temperature'][key] = 328.0  # the first heat burns
+    return layers
+
+
+def per_op_us(fn, items):
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - start) * 1e6 / max(1, len(items))
+
+
+def run(name, keys, ops, tile_layers, rng):
+    interact = game.interact if tile_layers else list_interact
+    player = FakePlayer()
+    start = time.perf_counter()
+    layers = build(keys, tile_layers)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    def act(action):
+        def step(key):
+            player.stand_on(key)
+            interact(player, layers, action)
+        return step
+
+    side = int(len(keys) ** 0.5)
+    empty = [(side + 10 + i, i) for i in range(ops)]
+    targets = rng.sample(keys, ops)
+    view = pygame.Rect(0, 0, game.WINDOW_WIDTH, game.WINDOW_HEIGHT)
+    views = [view.move(rng.randrange(side*TILE_SIZE), rng.randrange(side*TILE_SIZE)) for _ in range(ops)]
+    movers = [pygame.Rect(r.x, r.y, 20, 20) for r in views]
+
+    # list layers have no query; scan them the way the old code did
+    if tile_layers:
+        query = lambda r: layers['obstacles'].query(r)
+    else:
+        query = lambda r: [o for o in layers['obstacles'] if o.colliderect(r)]
+
+    with contextlib.redirect_stdout(io.StringIO()):  # interact() prints every edit
+        plant = per_op_us(act("plant"), empty)
+        cut = per_op_us(act("cut"), targets[:ops//2])
+        heat = per_op_us(act("heat"), targets[ops//2:])
+    collide = per_op_us(query, movers)
+    cull = per_op_us(query, views)
+    start = time.perf_counter()
+    count = sum(1 for _ in layers['trees'])
+    minimap_ms = (time.perf_counter() - start) * 1000
+    print(f"{name:>10} | build {build_ms:8.1f} ms | plant {plant:9.1f} us | cut {cut:9.1f} us | "
+          f"heat {heat:9.1f} us | collide {collide:9.1f} us | cull {cull:9.1f} us | "
+          f"minimap walk {minimap_ms:6.1f} ms ({count} trees)")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="WorldMap layer storage with many trees.")
+    ap.add_argument("--trees", type=int, default=100_000)
+    ap.add_argument("--ops", type=int, default=1000, help="edits/queries timed per operation")
+    ap.add_argument("--list-ops", type=int, default=100, help="same, for the (slow) list baseline")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    side = int(args.trees ** 0.5) + 1
+    keys = [(x, y) for y in range(side) for x in range(side)][:args.trees]
+    print(f"{len(keys)} trees on a {side}x{side} tile forest")
+    run("TileLayer", keys, args.ops, True, random.Random(args.seed))
+    run("list", keys, args.list_ops, False, random.Random(args.seed))
+
+
+if __name__ == "__main__":
+    main()